@@ -1,25 +1,142 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
-from .models import User, Service, Technology, Realisation, Article, Temoignage, Candidature
+from .audit import audit
+from .models import (
+    User, Service, Technology, Realisation, Article, Temoignage, Candidature, AuditEvent, OutboundEmail,
+    PREDEFINED_ADMINS,
+)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Sur Postgres, une liste non filtrée utilise l'estimation du planificateur
+    (pg_class.reltuples) au lieu d'un COUNT(*) complet dès que la table est grande.
+    """
+    ESTIMATE_THRESHOLD = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            connection = connections[self.object_list.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                        [self.object_list.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] > self.ESTIMATE_THRESHOLD:
+                    return row[0]
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Base commune : nombre de lignes estimé et pas de second COUNT(*) pour le total."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class ContentAdmin(LargeTableAdmin):
+    list_select_related = ('auteur',)
+    autocomplete_fields = ('auteur',)
+    search_fields = ('titre',)
+    list_filter = ('heure_cree',)
+    ordering = ('-heure_cree',)
+
+
+@admin.register(Service)
+class ServiceAdmin(ContentAdmin):
+    list_display = ('titre', 'auteur', 'heure_cree', 'heure_modifiee')
+
+
+@admin.register(Technology)
+class TechnologyAdmin(admin.ModelAdmin):
+    search_fields = ('name',)
+    ordering = ('name',)
+
+
+@admin.register(Realisation)
+class RealisationAdmin(ContentAdmin):
+    list_display = ('titre', 'client', 'auteur', 'heure_cree')
+    autocomplete_fields = ('auteur', 'technologies')
+
+
+@admin.register(Article)
+class ArticleAdmin(ContentAdmin):
+    list_display = ('titre', 'auteur', 'reading_time', 'heure_cree')
+    readonly_fields = ('excerpt', 'word_count', 'reading_time')
+
+
+@admin.register(Temoignage)
+class TemoignageAdmin(ContentAdmin):
+    list_display = ('nom', 'auteur', 'heure_cree')
+    search_fields = ('nom',)
+
+
+@admin.register(Candidature)
+class CandidatureAdmin(LargeTableAdmin):
+    list_display = ('user', 'application_type', 'start_month', 'created_at')
+    # __str__ lit self.user : jointure dans la même requête
+    list_select_related = ('user',)
+    # Pas de date_hierarchy : elle parcourt toute la table pour lister les années
+    list_filter = ('application_type', 'created_at')
+    autocomplete_fields = ('user',)
+    search_fields = ('user__username', 'user__email')
+    ordering = ('-created_at',)
+
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(LargeTableAdmin):
+    """Journal d'audit en lecture seule."""
+    list_display = ('created_at', 'event', 'user_id', 'actor_id', 'ip_address')
+    list_filter = ('event',)
+    search_fields = ('=user_id', '=actor_id')
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(LargeTableAdmin):
+    """File d'attente des emails : suivi des envois et des erreurs."""
+    list_display = ('to_email', 'kind', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('to_email',)
+    ordering = ('-created_at',)
+    readonly_fields = ('user', 'last_error', 'created_at', 'sent_at')
+    actions = ['retry_now']
+
+    @admin.action(description=_('Retry selected emails now'))
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='pending', next_attempt_at=timezone.now())
+        self.message_user(request, f"{updated} email(s) remis en file")
 
-# Enregistrement des autres modèles
-admin.site.register(Service)
-admin.site.register(Technology)
-admin.site.register(Realisation)
-admin.site.register(Article)
-admin.site.register(Temoignage)
-admin.site.register(Candidature)
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
     ordering = ['email']
     list_display = ['email', 'role', 'is_active', 'is_verified']
+    list_filter = ('role', 'is_active', 'is_verified')
+    actions = ['suspend_users', 'activate_users']
 
     # Organisation des champs dans la page de détail d'un utilisateur
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
-        (_('Personal info'), {'fields': ('cv', 'username')}),
+        (_('Personal info'), {'fields': ('username',)}),
         (_('Permissions'), {
             'fields': ('is_active', 'is_staff', 'is_superuser', 'role', 'is_verified', 'groups', 'user_permissions')
         }),
@@ -36,3 +153,25 @@ class UserAdmin(BaseUserAdmin):
     )
 
     search_fields = ('email',)
+
+    # Actions groupées : un seul UPDATE quelle que soit la taille de la sélection
+    @admin.action(description=_('Suspend selected users'))
+    def suspend_users(self, request, queryset):
+        updated = self._set_active(request, queryset.exclude(username__in=PREDEFINED_ADMINS), False, 'suspend')
+        self.message_user(request, f"{updated} utilisateur(s) suspendu(s)")
+
+    @admin.action(description=_('Activate selected users'))
+    def activate_users(self, request, queryset):
+        updated = self._set_active(request, queryset, True, 'activate')
+        self.message_user(request, f"{updated} utilisateur(s) activé(s)")
+
+    def _set_active(self, request, queryset, is_active, action):
+        # save() par utilisateur, comme l'API : les signaux (tableau de bord,
+        # statistiques) et l'audit voient chaque changement, contrairement à update()
+        updated = 0
+        for user in queryset.exclude(is_active=is_active):
+            user.is_active = is_active
+            user.save(update_fields=['is_active'])
+            audit(action, request, user=user, actor=request.user)
+            updated += 1
+        return updated
@@ -0,0 +1,93 @@
+"""
+Buffered audit log: events are kept in memory per worker process and written
+with one bulk INSERT when the buffer is full, when it gets old (background
+timer) and at interpreter exit.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from .models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+class AuditBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.first_event_at = None
+        self.pid = None
+        self.timer = None
+
+    @property
+    def max_size(self):
+        return settings.AUDIT_BUFFER_SIZE
+
+    @property
+    def max_age(self):
+        return settings.AUDIT_FLUSH_INTERVAL
+
+    def _ensure_timer(self):
+        # Threads do not survive fork(): start one per worker process
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.events = []
+            self.timer = threading.Thread(target=self._run_timer, name='audit-flush', daemon=True)
+            self.timer.start()
+
+    def _run_timer(self):
+        while True:
+            time.sleep(self.max_age)
+            if self.first_event_at and time.monotonic() - self.first_event_at >= self.max_age:
+                self.flush()
+                # This thread owns its own connection
+                connection.close()
+
+    def record(self, event, user=None, actor=None, ip=None, **data):
+        entry = AuditEvent(
+            event=event,
+            user_id=getattr(user, 'pk', user),
+            actor_id=getattr(actor, 'pk', actor),
+            ip_address=ip,
+            data=data,
+            created_at=timezone.now(),
+        )
+        with self.lock:
+            self._ensure_timer()
+            if not self.events:
+                self.first_event_at = time.monotonic()
+            self.events.append(entry)
+            full = len(self.events) >= self.max_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            events, self.events = self.events, []
+            self.first_event_at = None
+        if not events:
+            return 0
+        try:
+            AuditEvent.objects.bulk_create(events)
+        except DatabaseError:
+            logger.exception("Could not write %d audit events", len(events))
+            return 0
+        return len(events)
+
+
+audit_buffer = AuditBuffer()
+atexit.register(audit_buffer.flush)
+
+
+def audit(event, request=None, **kwargs):
+    """Record an audit event; ``request`` provides the client IP."""
+    if request is not None and 'ip' not in kwargs:
+        kwargs['ip'] = request.META.get('REMOTE_ADDR')
+    audit_buffer.record(event, **kwargs)
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework.authentication import BaseAuthentication, BasicAuthentication, SessionAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+User = get_user_model()
+
+KEY_SALT = 'Atsweb.authentication.basic'
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    Authentification Basic dont les identifiants vérifiés sont gardés en cache
+    pendant ``BASIC_AUTH_CACHE_TTL`` secondes, pour éviter un hachage complet du
+    mot de passe à chaque appel des scripts internes.
+
+    La clé de cache est un HMAC (SECRET_KEY) de l'identifiant et du mot de passe :
+    le cache ne contient jamais le mot de passe. La valeur associe l'id de
+    l'utilisateur à une empreinte de son hash de mot de passe ; un changement de
+    mot de passe ou une suspension invalide donc l'entrée au prochain appel.
+    """
+    cache = cache
+
+    def cache_key(self, userid, password):
+        digest = salted_hmac(KEY_SALT, f"{userid}\x00{password}", algorithm='sha256').hexdigest()
+        return f"basic-auth:{digest}"
+
+    def credential_stamp(self, user):
+        return salted_hmac(KEY_SALT, user.password, algorithm='sha256').hexdigest()
+
+    def authenticate_credentials(self, userid, password, request=None):
+        key = self.cache_key(userid, password)
+        cached = self.cache.get(key)
+        if cached is not None:
+            user_id, stamp = cached
+            user = User.objects.filter(pk=user_id).first()
+            if (user is not None and user.is_active
+                    and constant_time_compare(stamp, self.credential_stamp(user))):
+                return (user, None)
+            self.cache.delete(key)
+
+        # Vérification complète (hachage) ; peut réécrire le hash (voir hashers.py)
+        user, auth = super().authenticate_credentials(userid, password, request)
+        self.cache.set(key, (user.pk, self.credential_stamp(user)), settings.BASIC_AUTH_CACHE_TTL)
+        return (user, auth)
+
+
+class HeaderDispatchAuthentication(BaseAuthentication):
+    """
+    Choisit un seul mode d'authentification d'après la requête au lieu de les
+    essayer l'un après l'autre : en-tête ``Authorization: Bearer`` -> JWT,
+    ``Authorization: Basic`` -> Basic (avec cache), sinon cookie de session.
+    Un en-tête Authorization explicite est prioritaire sur le cookie.
+    """
+    session = SessionAuthentication()
+    jwt = JWTAuthentication()
+    basic = CachedBasicAuthentication()
+
+    def select(self, request):
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        scheme = header.split(' ', 1)[0].lower()
+        if scheme == 'bearer':
+            return self.jwt
+        if scheme == 'basic':
+            return self.basic
+        if not header and settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return self.session
+        return None
+
+    def authenticate(self, request):
+        authenticator = self.select(request)
+        if authenticator is None:
+            return None
+        return authenticator.authenticate(request)
+
+    def authenticate_header(self, request):
+        # Comme avant (SessionAuthentication en premier) : pas de WWW-Authenticate, donc 403
+        return None
@@ -0,0 +1,66 @@
+"""
+Database connection reuse (DB_CONN_MODE in config/settings.py).
+
+With ``pool``, each process owns a psycopg 3 ConnectionPool per database (Django
+creates it on first use); connections are checked before being handed to a
+request (CONN_HEALTH_CHECKS). Pools must never cross a fork: preload() and the
+gunicorn post_fork hook close them, workers open their own.
+
+Pool statistics are per process: DatabaseHealthView reports those of the worker
+that answered.
+"""
+import time
+
+from django.db import DatabaseError, connections
+
+
+def pooled(connection):
+    return bool(connection.settings_dict.get('OPTIONS', {}).get('pool'))
+
+
+def connection_mode(connection):
+    if pooled(connection):
+        return 'pool'
+    return 'persistent' if connection.settings_dict.get('CONN_MAX_AGE') else 'none'
+
+
+def close_pools():
+    """Close the pools of this process (their connections and maintenance threads)."""
+    # Pools are per process, not per thread: check every alias. Only close pools
+    # that exist (DatabaseWrapper.pool would create one just to close it).
+    for connection in connections.all():
+        if pooled(connection) and connection.alias in getattr(connection, '_connection_pools', {}):
+            connection.close_pool()
+
+
+def check_connection(connection):
+    """(healthy, milliseconds) for a round trip on ``connection``."""
+    start = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except DatabaseError:
+        return False, None
+    return True, round((time.perf_counter() - start) * 1000, 2)
+
+
+def database_stats():
+    """{alias: {...}} health and connection reuse metrics of this process."""
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        healthy, latency_ms = check_connection(connection)
+        entry = {
+            'vendor': connection.vendor,
+            'mode': connection_mode(connection),
+            'healthy': healthy,
+            'latency_ms': latency_ms,
+            'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+        }
+        if pooled(connection):
+            # pool_size, pool_available, requests_waiting, requests_wait_ms,
+            # connections_num, connections_lost, ... since the pool was opened
+            entry['pool'] = connection.pool.get_stats()
+        stats[alias] = entry
+    return stats
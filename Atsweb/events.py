@@ -0,0 +1,239 @@
+"""
+Server-sent events for the admin dashboard (ASGI only, see config/asgi.py).
+
+Model signals publish content changes to a single in-process Broadcaster which
+fans them out to every connected dashboard. Stats are recomputed at most once per
+STATS_INTERVAL whatever the number of listeners, and only the changed values are
+pushed. A client that does not keep up fills its queue and is disconnected; the
+browser's EventSource reconnects and receives a fresh snapshot.
+
+The broadcaster is per process: a change only reaches the dashboards connected to
+the worker process that saved it. Run the ASGI server with a single worker, or
+route /api/events/ and the admin writes to the same one; dashboards on other
+workers only see the change after their next reconnect (fresh snapshot).
+
+EventSource cannot send an Authorization header: the dashboard first gets a
+single-use ticket (POST /api/events/ticket/, valid TICKET_TTL seconds) and opens
+``/api/events/?ticket=...``, so no access token ends up in access logs. This app
+bypasses Django's middleware, so it answers CORS itself (CORS_ALLOWED_ORIGINS).
+"""
+import asyncio
+import hashlib
+import json
+import secrets
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .stats import dashboard_stats
+
+QUEUE_SIZE = 100
+STATS_INTERVAL = 2  # seconds
+HEARTBEAT_INTERVAL = 15  # seconds
+TICKET_TTL = 30  # seconds
+
+OVERFLOW = object()
+
+
+def run_as_request(func, *args):
+    """
+    Run ``func`` the way a request would use the database: connections past
+    CONN_MAX_AGE (or broken) are closed before and after, instead of being held
+    by the event loop's worker thread forever.
+    """
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n".encode()
+
+
+class Broadcaster:
+    def __init__(self):
+        self.subscribers = set()
+        self.loop = None
+        self.stats = None
+        self.stats_dirty = False
+        self.stats_task = None
+
+    def subscribe(self):
+        self.loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self.stats_task is None or self.stats_task.done():
+            self.stats_task = self.loop.create_task(self._stats_loop())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def publish(self, event, data):
+        """Thread-safe: called from model signals, usually in a sync worker thread."""
+        if self.loop is None or not self.subscribers or self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self._fan_out, format_event(event, data))
+
+    def mark_stats_dirty(self):
+        self.stats_dirty = True
+
+    def _fan_out(self, message):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Back-pressure: drop the slow client rather than buffer without bound
+                self.subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(OVERFLOW)
+
+    async def _stats_loop(self):
+        while self.subscribers:
+            await asyncio.sleep(STATS_INTERVAL)
+            if not self.stats_dirty:
+                continue
+            self.stats_dirty = False
+            stats = await sync_to_async(run_as_request)(dashboard_stats)
+            previous = self.stats or {}
+            delta = {key: value for key, value in stats.items() if previous.get(key) != value}
+            self.stats = stats
+            if delta:
+                self._fan_out(format_event('stats', delta))
+
+    async def snapshot(self):
+        if self.stats is None or self.stats_dirty:
+            self.stats = await sync_to_async(run_as_request)(dashboard_stats)
+        return self.stats
+
+
+broadcaster = Broadcaster()
+
+
+def _ticket_key(ticket):
+    return f"events:ticket:{hashlib.sha256(ticket.encode()).hexdigest()}"
+
+
+def issue_ticket(user):
+    """Single-use ticket opening one event stream as ``user`` within TICKET_TTL seconds."""
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_ticket_key(ticket), user.pk, TICKET_TTL)
+    return ticket
+
+
+def _redeem_ticket(ticket):
+    key = _ticket_key(ticket)
+    user_pk = cache.get(key)
+    # delete() reports whether the key existed: only one of two racing uses wins
+    if user_pk is None or not cache.delete(key):
+        return None
+    return get_user_model().objects.filter(pk=user_pk, is_active=True).first()
+
+
+def _authenticate_bearer(token):
+    authenticator = JWTAuthentication()
+    try:
+        return authenticator.get_user(authenticator.get_validated_token(token))
+    except AuthenticationFailed:
+        return None
+
+
+async def authenticate(scope):
+    """Stream ticket from ``?ticket=`` (EventSource) or a JWT in the Authorization header."""
+    ticket = parse_qs(scope.get('query_string', b'').decode()).get('ticket', [None])[0]
+    if ticket:
+        return await sync_to_async(run_as_request)(_redeem_ticket, ticket)
+    header = dict(scope.get('headers', [])).get(b'authorization', b'')
+    parts = header.split()
+    if len(parts) == 2 and parts[0].lower() == b'bearer':
+        return await sync_to_async(run_as_request)(_authenticate_bearer, parts[1])
+    return None
+
+
+def cors_headers(scope):
+    """Access-Control-* headers for an allowed Origin (same rules as django-cors-headers)."""
+    origin = dict(scope.get('headers', [])).get(b'origin', b'').decode('latin-1')
+    allowed = getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False) or origin in settings.CORS_ALLOWED_ORIGINS
+    if not origin or not allowed:
+        return [(b'vary', b'origin')]
+    headers = [(b'access-control-allow-origin', origin.encode('latin-1')), (b'vary', b'origin')]
+    if getattr(settings, 'CORS_ALLOW_CREDENTIALS', False):
+        headers.append((b'access-control-allow-credentials', b'true'))
+    return headers
+
+
+async def _send_empty(send, status, headers=()):
+    await send({
+        'type': 'http.response.start', 'status': status,
+        'headers': [(b'content-length', b'0'), *headers],
+    })
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def sse_application(scope, receive, send):
+    cors = cors_headers(scope)
+    if scope['method'] == 'OPTIONS':
+        # Preflight of fetch()-based clients sending Authorization
+        return await _send_empty(send, 204, [
+            *cors,
+            (b'access-control-allow-methods', b'GET, OPTIONS'),
+            (b'access-control-allow-headers', b'authorization, last-event-id'),
+            (b'access-control-max-age', b'86400'),
+        ])
+    user = await authenticate(scope)
+    if user is None:
+        return await _send_empty(send, 401, cors)
+    if getattr(user, 'role', None) != 'admin':
+        return await _send_empty(send, 403, cors)
+
+    queue = broadcaster.subscribe()
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected.set()
+        if not queue.full():
+            queue.put_nowait(OVERFLOW)  # wake the sender up
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+                *cors,
+            ],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': format_event('stats', await broadcaster.snapshot()),
+            'more_body': True,
+        })
+        while not disconnected.is_set():
+            try:
+                message = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                message = b': ping\n\n'
+            if message is OVERFLOW:
+                if not disconnected.is_set():
+                    await send({'type': 'http.response.body', 'body': format_event('overflow', {}), 'more_body': True})
+                break
+            await send({'type': 'http.response.body', 'body': message, 'more_body': True})
+        if not disconnected.is_set():
+            await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        broadcaster.unsubscribe(queue)
+        watcher.cancel()
@@ -0,0 +1,75 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Candidature
+
+User = get_user_model()
+
+CHUNK_SIZE = 2000
+
+# resource -> (values() queryset factory, date field used by since/until)
+EXPORTS = {
+    'users': (
+        lambda: User.objects.values(
+            'id', 'username', 'email', 'role', 'is_active', 'is_verified',
+            'date_joined', 'last_login', 'ip_address',
+        ),
+        'date_joined',
+    ),
+    'candidatures': (
+        # Joined in the same SELECT: no per-row query for the user
+        lambda: Candidature.objects.values(
+            'id', 'application_type', 'start_month', 'cv', 'created_at',
+            user_username=F('user__username'), user_email=F('user__email'),
+        ),
+        'created_at',
+    ),
+}
+
+
+class Echo:
+    """Pseudo-buffer: csv.writer hands back each line instead of storing it."""
+    def write(self, value):
+        return value
+
+
+def filter_date_range(queryset, date_field, since=None, until=None):
+    """Rows whose ``date_field`` falls between the days ``since`` and ``until`` (inclusive)."""
+    # Plain datetime bounds (rather than __date) so an index on the column is usable
+    if since:
+        start = datetime.combine(since, time.min, tzinfo=timezone.get_current_timezone())
+        queryset = queryset.filter(**{f'{date_field}__gte': start})
+    if until:
+        end = datetime.combine(until + timedelta(days=1), time.min, tzinfo=timezone.get_current_timezone())
+        queryset = queryset.filter(**{f'{date_field}__lt': end})
+    return queryset
+
+
+def export_queryset(resource, since=None, until=None):
+    queryset_factory, date_field = EXPORTS[resource]
+    queryset = filter_date_range(queryset_factory(), date_field, since, until)
+    # Date order keeps the range filter on the date index (no full scan in id order)
+    return queryset.order_by(date_field, 'id')
+
+
+def stream_csv(queryset):
+    fieldnames = list(queryset.query.values_select) + list(queryset.query.annotation_select)
+    writer = csv.DictWriter(Echo(), fieldnames=fieldnames)
+    yield writer.writeheader()
+    # Server-side cursor on Postgres: memory stays constant whatever the table size
+    for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield writer.writerow({
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row.items()
+        })
+
+
+def stream_ndjson(queryset):
+    for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,108 @@
+"""
+Idempotent creation: a client sends ``Idempotency-Key: <unique value>`` with a
+POST and may retry it as often as needed. The key is reserved in the database
+(IdempotencyKey, unique per user and endpoint) before the object is created; the
+first successful response is stored with it and replayed as is
+(``Idempotent-Replayed: true``) for IDEMPOTENCY_TTL seconds instead of creating
+the object again. Expired keys are removed by ``purge_idempotency_keys``.
+
+A replay whose payload differs from the original gets 422; a retry arriving
+while the original is still being processed gets 409. A failed original frees
+the key. Anonymous requests are not deduplicated.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+from .storage import content_hash
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+LOCK_TIMEOUT = 60  # seconds, longer than any create request
+
+
+def expired_before(now=None):
+    return (now or timezone.now()) - timedelta(seconds=settings.IDEMPOTENCY_TTL)
+
+
+def request_fingerprint(request):
+    """Hash of the submitted payload; uploaded files count by content."""
+    data = request.data
+    if hasattr(data, 'getlist'):
+        items = {key: data.getlist(key) for key in data.keys()}
+    else:
+        items = data
+    normalized = json.dumps(
+        items, sort_keys=True,
+        default=lambda value: f"sha256:{content_hash(value)}" if isinstance(value, UploadedFile) else str(value),
+    )
+    return hashlib.sha256(f"{request.path}\n{normalized}".encode()).hexdigest()
+
+
+def reserve(user, scope, key, fingerprint):
+    """(record, True) when this request now owns the key, else (existing record or None, False)."""
+    now = timezone.now()
+    keys = IdempotencyKey.objects.filter(user=user, scope=scope, key=key)
+    # Expired keys, and reservations whose request died, can be taken again
+    keys.filter(Q(created_at__lt=expired_before(now))
+                | Q(status__isnull=True, created_at__lt=now - timedelta(seconds=LOCK_TIMEOUT))).delete()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                user=user, scope=scope, key=key, fingerprint=fingerprint, created_at=now), True
+    except IntegrityError:
+        # None: the original failed and freed the key in the meantime
+        return keys.first(), False
+
+
+class IdempotentCreateMixin:
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key or not request.user.is_authenticated:
+            return super().create(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f'{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fingerprint = request_fingerprint(request)
+        record, reserved = reserve(request.user, self.basename, key, fingerprint)
+        if not reserved:
+            return self.replay(record, fingerprint)
+        try:
+            response = super().create(request, *args, **kwargs)
+        except BaseException:
+            record.delete()
+            raise
+        if not status.is_success(response.status_code):
+            record.delete()
+            return response
+        record.status = response.status_code
+        record.data = response.data
+        record.headers = {name: response[name] for name in ('Location',) if response.has_header(name)}
+        record.save(update_fields=['status', 'data', 'headers'])
+        return response
+
+    def replay(self, record, fingerprint):
+        if record is None or record.status is None:
+            return Response(
+                {'error': f'A request with this {IDEMPOTENCY_HEADER} is already being processed'},
+                status=status.HTTP_409_CONFLICT
+            )
+        if record.fingerprint != fingerprint:
+            return Response(
+                {'error': f'{IDEMPOTENCY_HEADER} was already used with a different payload'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        headers = dict(record.headers, **{'Idempotent-Replayed': 'true'})
+        return Response(record.data, status=record.status, headers=headers)
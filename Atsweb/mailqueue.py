@@ -0,0 +1,109 @@
+"""
+Outbound mail queue.
+
+Requests only insert OutboundEmail rows (in their own transaction); the
+send_mail_queue worker claims due messages in batches and sends them over one
+SMTP connection kept open while there is work. A failed message is retried with
+exponential backoff (MAIL_QUEUE_RETRY_BASE * 2**(attempts - 1) seconds, capped at
+MAIL_QUEUE_RETRY_MAX) and marked failed after MAIL_QUEUE_MAX_ATTEMPTS.
+"""
+import logging
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+# A claimed batch is invisible to other workers this long (longer than a batch
+# ever takes); a worker that crashes mid-batch has its messages picked up again.
+LEASE = timedelta(minutes=5)
+
+
+def backoff(attempts):
+    seconds = settings.MAIL_QUEUE_RETRY_BASE * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.MAIL_QUEUE_RETRY_MAX))
+
+
+def is_permanent(exc):
+    """5xx SMTP replies (unknown mailbox, rejected content) will not succeed on retry."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _message in exc.recipients.values())
+    return exc.smtp_code >= 500
+
+
+def claim_batch(size):
+    """Due pending messages, leased to this worker."""
+    now = timezone.now()
+    with transaction.atomic():
+        queryset = OutboundEmail.objects.filter(status='pending', next_attempt_at__lte=now).order_by('next_attempt_at')
+        if connection.features.has_select_for_update_skip_locked:
+            # Concurrent workers take different rows instead of waiting on each other
+            queryset = queryset.select_for_update(skip_locked=True)
+        batch = list(queryset[:size])
+        OutboundEmail.objects.filter(pk__in=[message.pk for message in batch]).update(next_attempt_at=now + LEASE)
+    return batch
+
+
+class MailSender:
+    """Sends batches over a single SMTP connection, reopened only after an error."""
+
+    def __init__(self):
+        self.connection = None
+
+    def open(self):
+        if self.connection is None:
+            self.connection = get_connection(fail_silently=False)
+            self.connection.open()
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.connection = None
+
+    def send_batch(self, batch):
+        """Send ``batch`` (OutboundEmail rows); returns (sent, failed) counts."""
+        sent = []
+        failed = []  # (message, error, permanent)
+        for index, message in enumerate(batch):
+            email = EmailMessage(message.subject, message.body, settings.DEFAULT_FROM_EMAIL, [message.to_email])
+            try:
+                self.open()
+                self.connection.send_messages([email])
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as exc:
+                # The server answered (smtplib reset the transaction): only this
+                # message is affected and the connection stays usable
+                logger.warning("Sending email %s to %s failed: %s", message.pk, message.to_email, exc)
+                failed.append((message, exc, is_permanent(exc)))
+            except (smtplib.SMTPException, OSError) as exc:
+                # Server unreachable or connection lost: retry the rest of the batch later
+                logger.warning("SMTP connection failed, %d email(s) rescheduled: %s", len(batch) - index, exc)
+                failed.extend((pending, exc, False) for pending in batch[index:])
+                self.close()
+                break
+            else:
+                sent.append(message.pk)
+
+        now = timezone.now()
+        if sent:
+            OutboundEmail.objects.filter(pk__in=sent).update(
+                status='sent', sent_at=now, attempts=F('attempts') + 1, last_error='')
+        for message, exc, permanent in failed:
+            attempts = message.attempts + 1
+            given_up = permanent or attempts >= settings.MAIL_QUEUE_MAX_ATTEMPTS
+            OutboundEmail.objects.filter(pk=message.pk).update(
+                status='failed' if given_up else 'pending',
+                attempts=attempts,
+                next_attempt_at=now + backoff(attempts),
+                last_error=f"{type(exc).__name__}: {exc}"[:1000],
+            )
+        return len(sent), len(failed)
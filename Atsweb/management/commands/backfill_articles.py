@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from Atsweb.models import Article
+
+
+class Command(BaseCommand):
+    help = "Recalcule les champs dérivés des articles (extrait, HTML, nombre de mots, temps de lecture)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch, total = [], 0
+        for article in Article.objects.only('pk', 'description').iterator(chunk_size=batch_size):
+            article.compute_derived_fields()
+            batch.append(article)
+            if len(batch) >= batch_size:
+                total += self._flush(batch)
+                batch = []
+        if batch:
+            total += self._flush(batch)
+        self.stdout.write(self.style.SUCCESS(f"{total} articles mis à jour"))
+
+    def _flush(self, batch):
+        # bulk_update leaves heure_modifiee untouched
+        Article.objects.bulk_update(batch, Article.DERIVED_FIELDS)
+        return len(batch)
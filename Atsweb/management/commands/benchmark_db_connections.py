@@ -0,0 +1,164 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.backends.signals import connection_created
+
+from Atsweb.dbpool import close_pools, pooled
+from Atsweb.models import Article
+
+MODES = ['none', 'persistent', 'pool']
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def simulated_request():
+    """One request as the handler runs it: connection checkout, a query, release."""
+    request_started.send(sender=None)
+    try:
+        list(Article.objects.order_by('-heure_cree').values_list('pk', flat=True)[:10])
+    finally:
+        request_finished.send(sender=None)
+
+
+def configure_mode(mode):
+    """Apply ``mode`` to the connections the benchmark threads will open."""
+    if mode == 'pool':
+        if not pooled(connection):
+            raise CommandError("Le mode pool demande PostgreSQL configuré avec DB_CONN_MODE=pool")
+        return
+    # none / persistent work on any backend: set on the settings the per-thread connections copy
+    db = connections.settings[DEFAULT_DB_ALIAS]
+    db['CONN_MAX_AGE'] = (db.get('CONN_MAX_AGE') or 60) if mode == 'persistent' else 0
+
+
+def run_worker(mode, threads, requests):
+    """Latencies of ``threads`` threads sending ``requests`` requests each, at once."""
+    configure_mode(mode)
+    latencies = []
+    errors = []
+    created = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def count_connection(sender, **kwargs):
+        created.append(1)
+
+    def client():
+        local = []
+        barrier.wait()
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                simulated_request()
+            except Exception as exc:  # pool timeout, too many connections
+                errors.append(f"{type(exc).__name__}: {exc}")
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+        connections.close_all()
+
+    connection_created.connect(count_connection)
+    start = time.perf_counter()
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    pool_stats = connection.pool.get_stats() if pooled(connection) else None
+    close_pools()
+    return {
+        'mode': mode,
+        'elapsed': elapsed,
+        'latencies': latencies,
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        # Pooled checkouts also fire connection_created: the pool counts real ones
+        'connections': pool_stats['connections_num'] if pool_stats else len(created),
+        'pool': pool_stats,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure la latence des requêtes sous concurrence selon la gestion des connexions "
+        "(nouvelle connexion par requête, connexions persistantes, pool psycopg). "
+        "Chaque mode tourne dans un processus séparé (DB_CONN_MODE) contre la base configurée ; "
+        "le mode pool demande PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default=','.join(MODES), help="Modes comparés, séparés par des virgules")
+        parser.add_argument('--threads', type=int, default=16, help="Requêtes simultanées")
+        parser.add_argument('--requests', type=int, default=200, help="Requêtes par thread")
+        parser.add_argument('--pool-size', type=int, default=None,
+                            help="DB_POOL_MAX_SIZE du mode pool (défaut : configuration courante)")
+        parser.add_argument('--worker', default=None, choices=MODES, help="Usage interne : exécute un seul mode")
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            result = run_worker(options['worker'], options['threads'], options['requests'])
+            self.stdout.write(json.dumps(result))
+            return
+
+        modes = options['modes'].split(',')
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f"Modes inconnus : {', '.join(sorted(unknown))} (choix : {', '.join(MODES)})")
+        if 'pool' in modes and connection.vendor != 'postgresql':
+            raise CommandError(f"Le mode pool demande PostgreSQL, base configurée : {connection.vendor}")
+
+        results = []
+        for mode in modes:
+            env = dict(os.environ, DB_CONN_MODE=mode, DJANGO_PRELOAD='0')
+            if options['pool_size']:
+                env['DB_POOL_MAX_SIZE'] = str(options['pool_size'])
+            manage = os.path.join(settings.BASE_DIR, 'manage.py')
+            completed = subprocess.run(
+                [sys.executable, manage, 'benchmark_db_connections', '--worker', mode,
+                 '--threads', str(options['threads']), '--requests', str(options['requests'])],
+                capture_output=True, text=True, env=env,
+            )
+            if completed.returncode != 0:
+                raise CommandError(f"{mode}: {completed.stderr[-2000:]}")
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+        self.stdout.write(
+            f"{options['threads']} threads x {options['requests']} requests\n"
+            f"{'mode':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+            f"{'conns':>8}{'errors':>8}"
+        )
+        for result in results:
+            latencies = sorted(result['latencies'])
+            if not latencies:
+                self.stdout.write(f"{result['mode']:<12}  no successful request: {result['first_error']}")
+                continue
+            self.stdout.write(
+                f"{result['mode']:<12}{len(latencies) / result['elapsed']:>10.0f}"
+                f"{statistics.median(latencies) * 1000:>10.2f}"
+                f"{percentile(latencies, 0.95) * 1000:>10.2f}"
+                f"{percentile(latencies, 0.99) * 1000:>10.2f}"
+                f"{latencies[-1] * 1000:>10.2f}"
+                f"{result['connections']:>8}{result['errors']:>8}"
+            )
+            if result['pool']:
+                stats = result['pool']
+                self.stdout.write(
+                    f"{'':<12}pool max {stats.get('pool_max')}, waits {stats.get('requests_queued', 0)}"
+                    f" ({stats.get('requests_wait_ms', 0)} ms total), lost {stats.get('connections_lost', 0)}"
+                )
+            if result['first_error']:
+                self.stdout.write(self.style.WARNING(f"{'':<12}{result['first_error']}"))
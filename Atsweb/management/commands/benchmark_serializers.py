@@ -0,0 +1,76 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from Atsweb import views
+from Atsweb.queryplans import viewset_queryset
+from Atsweb.valueserializers import compile_serializer
+
+VIEWSETS = {
+    'users': views.UserViewSet,
+    'services': views.ServiceViewSet,
+    'realisations': views.RealisationViewSet,
+    'articles': views.ArticleViewSet,
+    'temoignages': views.TemoignageViewSet,
+}
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare les sérialiseurs de liste DRF et leur version compilée (values()) : "
+        "vérifie que la sortie JSON est identique et mesure le gain."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('resources', nargs='*', help=f"Parmi {', '.join(VIEWSETS)} (toutes par défaut)")
+        parser.add_argument('--limit', type=int, default=5000, help="Lignes sérialisées par ressource")
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        request = Request(APIRequestFactory().get('/'))
+        context = {'request': request}
+        failed = []
+        unknown = set(options['resources']) - set(VIEWSETS)
+        if unknown:
+            raise CommandError(f"Ressource inconnue : {', '.join(sorted(unknown))}")
+
+        self.stdout.write(f"{'resource':<14}{'rows':>8}{'drf ms':>10}{'values ms':>11}{'speedup':>9}")
+        for resource in options['resources'] or VIEWSETS:
+            viewset_class = VIEWSETS[resource]
+            serializer_class = viewset_class(action='list').get_serializer_class()
+            compiled = compile_serializer(serializer_class)
+            if compiled is None:
+                self.stdout.write(f"{resource:<14}  {serializer_class.__name__} non compilable")
+                continue
+            queryset = viewset_queryset(viewset_class)[:options['limit']]
+
+            drf_time, drf_data = best_of(options['repeat'], lambda: serializer_class(
+                queryset, many=True, context=context).data)
+            values_time, values_data = best_of(options['repeat'], lambda: compiled.serialize(
+                queryset, context=context))
+
+            rows = queryset.count()
+            speedup = drf_time / values_time if values_time else float('inf')
+            self.stdout.write(
+                f"{resource:<14}{rows:>8}{drf_time * 1000:>10.1f}{values_time * 1000:>11.1f}{speedup:>8.1f}x"
+            )
+            if renderer.render(drf_data) != renderer.render(values_data):
+                failed.append(resource)
+                self.stderr.write(f"  {resource} : sortie différente du sérialiseur DRF")
+
+        if failed:
+            raise CommandError(f"Sortie non identique : {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS("Sorties identiques"))
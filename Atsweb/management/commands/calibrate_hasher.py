@@ -0,0 +1,59 @@
+import importlib.util
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.core.management.base import BaseCommand, CommandError
+
+
+def argon2_hasher(time_cost, memory_cost, parallelism):
+    """Hasher Argon2 avec les paramètres candidats, sans toucher aux settings."""
+    hasher = Argon2PasswordHasher()
+    hasher.time_cost = time_cost
+    hasher.memory_cost = memory_cost
+    hasher.parallelism = parallelism
+    return hasher
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le temps de hachage Argon2 et propose ARGON2_TIME_COST / ARGON2_MEMORY_COST / "
+        "ARGON2_PARALLELISM pour atteindre la latence cible par hachage sur cette machine."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target-ms', type=float, default=100, help="Latence visée par hachage")
+        parser.add_argument('--memory', type=int, default=settings.ARGON2_MEMORY_COST, help="Mémoire en KiB")
+        parser.add_argument('--parallelism', type=int, default=settings.ARGON2_PARALLELISM)
+        parser.add_argument('--samples', type=int, default=5)
+        parser.add_argument('--max-time-cost', type=int, default=20)
+
+    def measure(self, hasher, samples):
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            hasher.encode('calibration-password', hasher.salt())
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)[len(timings) // 2]  # median
+
+    def handle(self, *args, **options):
+        if not importlib.util.find_spec('argon2'):
+            raise CommandError("argon2-cffi n'est pas installé (pip install argon2-cffi) : rien à calibrer")
+        target = options['target_ms']
+        chosen = None
+        for time_cost in range(1, options['max_time_cost'] + 1):
+            hasher = argon2_hasher(time_cost, options['memory'], options['parallelism'])
+            elapsed = self.measure(hasher, options['samples'])
+            self.stdout.write(f"time_cost={time_cost:2d} memory={options['memory']} KiB -> {elapsed:.1f} ms")
+            chosen = (time_cost, elapsed)
+            if elapsed >= target:
+                break
+
+        time_cost, elapsed = chosen
+        self.stdout.write(self.style.SUCCESS(
+            f"\nARGON2_TIME_COST={time_cost}\nARGON2_MEMORY_COST={options['memory']}\n"
+            f"ARGON2_PARALLELISM={options['parallelism']}\n# ~{elapsed:.0f} ms par hachage "
+            f"(cible {target:.0f} ms)"
+        ))
+        if elapsed < target:
+            self.stdout.write("Cible non atteinte : augmenter --memory ou --max-time-cost")
@@ -0,0 +1,66 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from Atsweb.queryplans import capture
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'query_plans')
+
+
+class Command(BaseCommand):
+    help = (
+        "Capture le plan EXPLAIN des requêtes des endpoints de liste (base de données peuplée, "
+        "cf. generate_data), signale les parcours séquentiels et les plans qui ont changé "
+        "par rapport à la référence versionnée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', help="Fichier de référence (par défaut query_plans/<vendor>.json)")
+        parser.add_argument('--update', action='store_true', help="Réécrire la référence avec les plans actuels")
+        parser.add_argument('--verbose-plans', action='store_true', help="Afficher les plans qui diffèrent")
+
+    def handle(self, *args, **options):
+        baseline_path = options['baseline'] or os.path.normpath(
+            os.path.join(BASELINE_DIR, f"{connection.vendor}.json")
+        )
+        results = capture()
+
+        if options['update']:
+            with open(baseline_path, 'w') as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+                handle.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"{len(results)} plans enregistrés dans {baseline_path}"))
+            return
+
+        baseline = {}
+        if os.path.exists(baseline_path):
+            with open(baseline_path) as handle:
+                baseline = json.load(handle)
+        else:
+            self.stderr.write(f"Pas de référence {baseline_path} : seuls les parcours séquentiels sont vérifiés")
+
+        problems = 0
+        for name, result in results.items():
+            status = 'OK'
+            if result['seq_scan'] and not result['allow_seq_scan']:
+                status = 'SEQ SCAN'
+            elif name in baseline and baseline[name]['fingerprint'] != result['fingerprint']:
+                status = 'CHANGED'
+            elif baseline and name not in baseline:
+                status = 'NEW'
+
+            if status in ('SEQ SCAN', 'CHANGED'):
+                problems += 1
+                self.stdout.write(self.style.ERROR(f"{status:9} {name}"))
+                if options['verbose_plans']:
+                    if name in baseline:
+                        self.stdout.write("  avant : " + " | ".join(baseline[name]['plan']))
+                    self.stdout.write("  après : " + " | ".join(result['plan']))
+            else:
+                self.stdout.write(f"{status:9} {name}")
+
+        if problems:
+            raise CommandError(f"{problems} plan(s) à examiner")
+        self.stdout.write(self.style.SUCCESS("Aucune régression de plan"))
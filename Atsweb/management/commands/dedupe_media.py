@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from Atsweb.models import Candidature, Realisation, Service, Temoignage
+from Atsweb.storage import content_addressed_storage
+
+MEDIA_FIELDS = [
+    (Service, 'img'),
+    (Realisation, 'img'),
+    (Temoignage, 'img'),
+    (Candidature, 'cv'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Migre les fichiers existants vers le stockage par empreinte de contenu et "
+        "supprime les doublons (ex. hospital.png / hospital_37diSWt.png)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Afficher sans rien modifier")
+        parser.add_argument('--keep-originals', action='store_true',
+                            help="Ne pas supprimer les anciens fichiers après migration")
+
+    def handle(self, *args, **options):
+        storage = content_addressed_storage()
+        dry_run = options['dry_run']
+        old_names, new_names = set(), set()
+        moved = missing = 0
+
+        for model, field_name in MEDIA_FIELDS:
+            rows = (
+                model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                .values_list('pk', field_name)
+            )
+            for pk, name in rows.iterator(chunk_size=500):
+                if not storage.exists(name):
+                    missing += 1
+                    self.stderr.write(f"{model.__name__} #{pk}: fichier manquant {name}")
+                    continue
+                with storage.open(name) as content:
+                    target = storage.hashed_name(name, content)
+                    if target == name:
+                        new_names.add(name)
+                        continue
+                    if not dry_run and not storage.exists(target):
+                        storage.save(target, content)
+                self.stdout.write(f"{model.__name__} #{pk}: {name} -> {target}")
+                if not dry_run:
+                    # update() rather than save(): heure_modifiee must not move
+                    model.objects.filter(pk=pk).update(**{field_name: target})
+                old_names.add(name)
+                new_names.add(target)
+                moved += 1
+
+        removed = 0
+        if not dry_run and not options['keep_originals']:
+            for name in old_names - new_names:
+                storage.delete(name)
+                removed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{moved} références migrées, {len(new_names)} fichiers uniques, "
+            f"{removed} anciens fichiers supprimés, {missing} fichiers manquants"
+        ))
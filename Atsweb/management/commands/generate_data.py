@@ -0,0 +1,216 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.utils import timezone
+
+from Atsweb.models import User, Candidature, Service, Technology, Realisation, Article, Temoignage
+
+WORDS = (
+    "application web mobile plateforme données client projet solution cloud sécurité "
+    "performance équipe développement intégration analyse service gestion système réseau "
+    "innovation stratégie digital marché utilisateur interface qualité formation conseil"
+).split()
+
+HISTORY_DAYS = 730
+
+
+def _init_worker():
+    if not django.apps.apps.ready:
+        django.setup()
+    # Never share the parent's database socket with a forked child
+    connections.close_all()
+
+
+@contextmanager
+def historical_dates():
+    """Let generated rows keep their spread-out dates instead of auto_now(_add)."""
+    fields = [
+        model._meta.get_field(name)
+        for model in (Candidature, Service, Realisation, Article, Temoignage)
+        for name in ('created_at', 'heure_cree', 'heure_modifiee')
+        if any(f.name == name for f in model._meta.fields)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _rng(seed, kind, chunk):
+    # One stream per (kind, chunk): same output whatever the number of workers
+    return random.Random(f"{seed}:{kind}:{chunk}")
+
+
+def _moment(rng, now):
+    return now - timedelta(days=rng.random() * HISTORY_DAYS)
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _username(seed, index):
+    return f"load{seed}_{index}"
+
+
+def _pick_users(rng, seed, n_users, count):
+    """Random generated users, resolved to ids with one query."""
+    names = [_username(seed, rng.randrange(n_users)) for _ in range(count)]
+    ids = dict(User.objects.filter(username__in=set(names)).values_list('username', 'id'))
+    return [ids[name] for name in names]
+
+
+def generate_chunk(task):
+    kind, chunk, start, count, options = task
+    seed = options['seed']
+    rng = _rng(seed, kind, chunk)
+    now = options['now']
+
+    with historical_dates(), transaction.atomic():
+        if kind == 'users':
+            User.objects.bulk_create([
+                User(
+                    username=_username(seed, index), email=f"{_username(seed, index)}@example.test",
+                    password=options['password_hash'], role='user', is_active=rng.random() > 0.05,
+                    is_verified=rng.random() > 0.3, date_joined=_moment(rng, now),
+                )
+                for index in range(start, start + count)
+            ])
+
+        elif kind == 'candidatures':
+            user_ids = _pick_users(rng, seed, options['users'], count)
+            rows = []
+            for index, user_id in zip(range(start, start + count), user_ids):
+                candidature = Candidature(
+                    user_id=user_id,
+                    application_type=rng.choices(['stage', 'emploi'], weights=[3, 1])[0],
+                    start_month=rng.choice(['Janvier', 'Mars', 'Juin', 'Septembre']) + ' 2026',
+                    created_at=_moment(rng, now),
+                )
+                if rng.random() < options['cv_ratio']:
+                    # Distinct content per candidate, otherwise the storage deduplicates it
+                    body = f"%PDF-1.4\n% CV {seed}-{index}\n{_text(rng, 50)}\n%%EOF\n".encode()
+                    candidature.cv.save(f"cv_{index}.pdf", ContentFile(body), save=False)
+                rows.append(candidature)
+            Candidature.objects.bulk_create(rows)
+
+        elif kind == 'realisations':
+            technology_ids = options['technology_ids']
+            # Zipf-like skew: the first technologies are used far more than the tail
+            weights = [1 / (rank + 1) ** 1.2 for rank in range(len(technology_ids))]
+            authors = _pick_users(rng, seed, options['users'], count)
+            realisations = []
+            for index, author in zip(range(start, start + count), authors):
+                created = _moment(rng, now)
+                realisations.append(Realisation(
+                    titre=f"Réalisation {index}", client=f"Client {rng.randrange(1000)}",
+                    description=_text(rng, rng.randint(20, 200)), img='realisations/loadtest.png',
+                    auteur_id=author, heure_cree=created, heure_modifiee=created,
+                ))
+            Realisation.objects.bulk_create(realisations)
+            Through = Realisation.technologies.through
+            links = []
+            for realisation in realisations:
+                picked = set(rng.choices(technology_ids, weights=weights, k=rng.randint(1, 6)))
+                links.extend(Through(realisation_id=realisation.pk, technology_id=pk) for pk in picked)
+            Through.objects.bulk_create(links)
+
+        else:
+            model = {'articles': Article, 'services': Service, 'temoignages': Temoignage}[kind]
+            authors = _pick_users(rng, seed, options['users'], count)
+            rows = []
+            for index, author in zip(range(start, start + count), authors):
+                created = _moment(rng, now)
+                if model is Article:
+                    # Log-normal length: mostly short posts, a few very long ones
+                    words = min(int(rng.lognormvariate(6, 0.8)), 20000)
+                    obj = Article(titre=f"Article {index}", description=_text(rng, words))
+                    obj.compute_derived_fields()
+                elif model is Service:
+                    obj = Service(titre=f"Service {index}", description=_text(rng, rng.randint(20, 150)),
+                                  img='services/loadtest.png')
+                else:
+                    obj = Temoignage(nom=f"Témoin {index}", description=_text(rng, rng.randint(10, 80)))
+                obj.auteur_id = author
+                obj.heure_cree = obj.heure_modifiee = created
+                rows.append(obj)
+            model.objects.bulk_create(rows)
+    return kind, count
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données synthétique reproductible (graine) et volumineux pour les "
+        "tests de charge. Lancer ensuite rebuild_rollups --days 0 et rebuild_snapshots."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--candidatures', type=int, default=100000)
+        parser.add_argument('--technologies', type=int, default=60)
+        parser.add_argument('--realisations', type=int, default=5000)
+        parser.add_argument('--articles', type=int, default=5000)
+        parser.add_argument('--services', type=int, default=200)
+        parser.add_argument('--temoignages', type=int, default=2000)
+        parser.add_argument('--cv-ratio', type=float, default=0.5, help="Part des candidatures avec un CV")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=1)
+
+    def handle(self, *args, **options):
+        seed = options['seed']
+        if User.objects.filter(username=_username(seed, 0)).exists():
+            self.stderr.write(f"Des données existent déjà pour la graine {seed}")
+            return
+
+        technology_ids = [
+            Technology.objects.get_or_create(name=f"Tech {rank:03d}")[0].pk
+            for rank in range(options['technologies'])
+        ]
+        shared = {
+            'seed': seed,
+            # Dates are spread back from midnight so a rerun on the same day is identical
+            'now': timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0),
+            'users': options['users'],
+            'cv_ratio': options['cv_ratio'],
+            'technology_ids': technology_ids,
+            # One hash for every account: hashing millions of passwords would dominate
+            'password_hash': make_password('loadtest'),
+        }
+
+        # Users first: everything else references them
+        self._run([('users', options['users'])], options, shared)
+        self._run([
+            (kind, options[kind])
+            for kind in ('candidatures', 'realisations', 'articles', 'services', 'temoignages')
+        ], options, shared)
+        self.stdout.write(self.style.SUCCESS("Données générées"))
+
+    def _run(self, plan, options, shared):
+        batch_size = options['batch_size']
+        tasks = [
+            (kind, chunk, start, min(batch_size, total - start), shared)
+            for kind, total in plan
+            for chunk, start in enumerate(range(0, total, batch_size))
+        ]
+        if options['workers'] > 1:
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+                results = pool.map(generate_chunk, tasks)
+                for kind, count in results:
+                    self.stdout.write(f"{kind}: +{count}")
+        else:
+            for task in tasks:
+                kind, count = generate_chunk(task)
+                self.stdout.write(f"{kind}: +{count}")
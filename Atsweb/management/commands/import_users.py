@@ -0,0 +1,185 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from Atsweb.models import USER_ROLES
+
+User = get_user_model()
+
+
+def _init_worker():
+    # With the "spawn" start method the workers do not inherit Django's state
+    if not django.apps.apps.ready:
+        django.setup()
+
+
+def _hash_passwords(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def _read_rows(path, fmt):
+    """Yield one dict per record without loading the whole file in memory."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if fmt == 'csv':
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+class Command(BaseCommand):
+    help = (
+        "Importe des utilisateurs en masse depuis un fichier CSV ou JSONL "
+        "(colonnes: username, email, password ou password_hash, role)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fichier CSV ou JSONL à importer")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Déduit de l'extension par défaut")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Nombre de processus pour le hachage des mots de passe")
+        parser.add_argument('--role', choices=[role for role, _ in USER_ROLES], default='guest',
+                            help="Rôle par défaut quand la colonne role est absente")
+        parser.add_argument('--checkpoint', help="Fichier de reprise (par défaut <path>.checkpoint)")
+        parser.add_argument('--resume', action='store_true', help="Reprendre après le dernier lot enregistré")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"Fichier introuvable: {path}")
+
+        fmt = options['format'] or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+        batch_size = options['batch_size']
+        checkpoint = options['checkpoint'] or f"{path}.checkpoint"
+
+        done = 0
+        if options['resume'] and os.path.exists(checkpoint):
+            with open(checkpoint) as handle:
+                done = json.load(handle)['line']
+            self.stdout.write(f"Reprise après {done} lignes")
+
+        self.created = self.skipped = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            self.pool = pool
+            self.workers = options['workers']
+            batch = []
+            line = 0
+            for line, row in enumerate(_read_rows(path, fmt), start=1):
+                if line <= done:
+                    continue
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self._import_batch(batch, options['role'])
+                    self._save_checkpoint(checkpoint, line)
+                    batch = []
+            if batch:
+                self._import_batch(batch, options['role'])
+                self._save_checkpoint(checkpoint, line)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{self.created} utilisateurs créés, {self.skipped} lignes ignorées"
+        ))
+
+    def _save_checkpoint(self, checkpoint, line):
+        tmp = f"{checkpoint}.tmp"
+        with open(tmp, 'w') as handle:
+            json.dump({'line': line}, handle)
+        os.replace(tmp, checkpoint)
+
+    def _clean(self, batch, default_role):
+        """Normalize rows and drop invalid ones and duplicates inside the batch."""
+        rows, emails, usernames = [], set(), set()
+        for row in batch:
+            username = User.normalize_username((row.get('username') or '').strip())
+            email = User.objects.normalize_email((row.get('email') or '').strip())
+            role = row.get('role') or default_role
+            password_hash = row.get('password_hash') or ''
+            password = row.get('password') or ''
+            try:
+                validate_email(email)
+                if password_hash:
+                    identify_hasher(password_hash)
+            except (ValidationError, ValueError):
+                self.skipped += 1
+                continue
+            if (not username or role not in dict(USER_ROLES) or not (password or password_hash)
+                    or email.lower() in emails or username in usernames):
+                self.skipped += 1
+                continue
+            emails.add(email.lower())
+            usernames.add(username)
+            rows.append({
+                'username': username, 'email': email, 'role': role,
+                'password': password, 'password_hash': password_hash,
+            })
+        return rows
+
+    def _import_batch(self, batch, default_role):
+        rows = self._clean(batch, default_role)
+        if not rows:
+            return
+
+        # One query per column for the whole batch instead of one UniqueValidator per user
+        # Emails compare case-insensitively, as in the batch itself
+        existing_emails = set(
+            User.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower__in=[row['email'].lower() for row in rows])
+            .values_list('email_lower', flat=True)
+        )
+        existing_usernames = set(
+            User.objects.filter(username__in=[row['username'] for row in rows]).values_list('username', flat=True)
+        )
+        new_rows = [
+            row for row in rows
+            if row['email'].lower() not in existing_emails and row['username'] not in existing_usernames
+        ]
+        self.skipped += len(rows) - len(new_rows)
+        if not new_rows:
+            return
+
+        to_hash = [row for row in new_rows if not row['password_hash']]
+        if to_hash:
+            chunk = max(1, len(to_hash) // self.workers)
+            passwords = [row['password'] for row in to_hash]
+            chunks = [passwords[i:i + chunk] for i in range(0, len(passwords), chunk)]
+            hashes = [h for result in self.pool.map(_hash_passwords, chunks) for h in result]
+            for row, hashed in zip(to_hash, hashes):
+                row['password_hash'] = hashed
+
+        users = [
+            User(username=row['username'], email=row['email'], role=row['role'], password=row['password_hash'])
+            for row in new_rows
+        ]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users, batch_size=len(users))
+        except IntegrityError:
+            # A row was created meanwhile (or clashes in a way the checks above miss):
+            # keep the rest of the batch, insert row by row and report the rejects
+            self._import_rows(users)
+        else:
+            self.created += len(users)
+
+    def _import_rows(self, users):
+        for user in users:
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create([user])
+            except IntegrityError as exc:
+                self.skipped += 1
+                self.stderr.write(f"Ligne ignorée ({user.username}, {user.email}) : {exc}")
+            else:
+                self.created += 1
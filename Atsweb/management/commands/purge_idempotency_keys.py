@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from Atsweb.idempotency import expired_before
+from Atsweb.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime les clés Idempotency-Key plus anciennes que IDEMPOTENCY_TTL "
+        "(réponses qui ne sont plus rejouées). À lancer chaque nuit."
+    )
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=expired_before()).delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} clés supprimées"))
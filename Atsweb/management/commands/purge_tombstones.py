@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from Atsweb.models import Tombstone
+from Atsweb.sync import tombstone_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime les traces de suppression (Tombstone) plus anciennes que "
+        "SYNC_TOMBSTONE_RETENTION_DAYS. À lancer chaque nuit : /api/sync/ répond 410 aux "
+        "jetons antérieurs, les clients concernés refont une synchronisation complète."
+    )
+
+    def handle(self, *args, **options):
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=tombstone_cutoff()).delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} traces supprimées"))
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from Atsweb.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruit les agrégats journaliers (StatRollup) des jours clos à partir des tables "
+        "brutes. À lancer chaque nuit : corrige les écarts laissés par les écritures en masse "
+        "(bulk_create, update) qui ne déclenchent pas les signaux."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7,
+                            help="Nombre de jours clos à reconstruire (0 = tout l'historique)")
+
+    def handle(self, *args, **options):
+        since = None
+        if options['days']:
+            since = timezone.localdate() - timedelta(days=options['days'])
+        written = rebuild(since)
+        self.stdout.write(self.style.SUCCESS(f"{written} lignes d'agrégats reconstruites"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from Atsweb import snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruit les instantanés JSON des contenus publics, ou vérifie (--check) "
+        "qu'ils correspondent aux serializers actuels."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Vérifier sans reconstruire")
+
+    def handle(self, *args, **options):
+        failed = False
+        for model in snapshots.SHAPES:
+            name = model.__name__
+            if options['check']:
+                problems = snapshots.check(model)
+                for shape, object_id, problem in problems:
+                    self.stderr.write(f"{name} #{object_id} ({shape}): {problem}")
+                failed = failed or bool(problems)
+                self.stdout.write(f"{name}: {len(problems)} écart(s)")
+            else:
+                total = snapshots.rebuild(model)
+                self.stdout.write(f"{name}: {total} objets")
+        if failed:
+            raise SystemExit(1)
+        self.stdout.write(self.style.SUCCESS("OK"))
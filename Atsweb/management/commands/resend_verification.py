@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from Atsweb.models import OutboundEmail
+from Atsweb.verification import KIND, build_message
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Remet en file l'email de vérification des comptes actifs non vérifiés "
+        "(sauf ceux qui en ont déjà un en attente). Les envois sont faits par send_mail_queue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--joined-before-days', type=int, default=0,
+                            help="Seulement les comptes créés il y a au moins N jours")
+        parser.add_argument('--limit', type=int, default=None)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Compter sans rien mettre en file")
+
+    def handle(self, *args, **options):
+        users = (
+            User.objects.filter(is_verified=False, is_active=True)
+            .exclude(email='')
+            .exclude(pk__in=OutboundEmail.objects.filter(kind=KIND, status='pending')
+                     .exclude(user=None).values('user_id'))
+            .order_by('pk')
+            .only('pk', 'username', 'email')
+        )
+        if options['joined_before_days']:
+            users = users.filter(date_joined__lt=timezone.now() - timedelta(days=options['joined_before_days']))
+        if options['limit']:
+            users = users[:options['limit']]
+
+        if options['dry_run']:
+            self.stdout.write(f"{users.count()} email(s) seraient mis en file")
+            return
+
+        queued = 0
+        batch = []
+        for user in users.iterator(chunk_size=options['batch_size']):
+            batch.append(build_message(user))
+            if len(batch) >= options['batch_size']:
+                OutboundEmail.objects.bulk_create(batch)
+                queued += len(batch)
+                batch = []
+        if batch:
+            OutboundEmail.objects.bulk_create(batch)
+            queued += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"{queued} email(s) de vérification mis en file"))
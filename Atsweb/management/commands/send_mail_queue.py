@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from Atsweb.mailqueue import MailSender, claim_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker d'envoi des emails en file (OutboundEmail) : envoie les messages dus par lots "
+        "sur une seule connexion SMTP et replanifie les échecs avec un délai croissant."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--interval', type=float, default=5,
+                            help="Secondes d'attente quand la file est vide")
+        parser.add_argument('--once', action='store_true', help="Vider la file une fois puis quitter")
+
+    def handle(self, *args, **options):
+        sender = MailSender()
+        try:
+            while True:
+                batch = claim_batch(options['batch_size'])
+                if batch:
+                    sent, failed = sender.send_batch(batch)
+                    self.stdout.write(f"{sent} envoyé(s), {failed} en échec")
+                    if sent or not failed:
+                        continue
+                    # Nothing went through (server down?): wait before the next batch
+                # Idle: do not hold the SMTP or database connection open
+                sender.close()
+                if options['once']:
+                    break
+                connection.close()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sender.close()
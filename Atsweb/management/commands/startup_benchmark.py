@@ -0,0 +1,96 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Import time budget per top-level package (self time of its modules), in milliseconds
+IMPORT_BUDGET_MS = {
+    'django': 400,
+    'psycopg': 150,
+    'rest_framework': 100,
+    'rest_framework_simplejwt': 50,
+    'corsheaders': 20,
+    'Atsweb': 80,
+    # Module bodies of config.* include django.setup() (app registry, models)
+    'config': 150,
+}
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import {module}
+loaded = time.perf_counter()
+from config.preload import preload
+timings = preload()
+print(json.dumps({{'load': loaded - start, 'preload': timings}}))
+"""
+
+
+def parse_importtime(stderr):
+    """{module: (self us, cumulative us, depth)} from ``python -X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le démarrage d'un worker dans un interpréteur neuf : temps d'import par "
+        "paquet (comparé au budget), chargement de l'application et préchargement."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default='config.wsgi', help="config.wsgi ou config.asgi")
+        parser.add_argument('--top', type=int, default=15, help="Nombre de modules les plus lents affichés")
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help="Multiplie les budgets (machines lentes, CI)")
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_PRELOAD='0')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE.format(module=options['module'])],
+            capture_output=True, text=True, env=env,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr[-2000:])
+        modules = parse_importtime(result.stderr)
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+
+        # Self time summed per top-level package: each module counted once
+        per_package = defaultdict(int)
+        for name, (self_us, _cumulative_us, _depth) in modules.items():
+            per_package[name.split('.')[0]] += self_us
+
+        self.stdout.write(f"{'package':<28}{'ms':>10}{'budget':>10}")
+        over = []
+        for package, budget in IMPORT_BUDGET_MS.items():
+            spent = per_package.get(package, 0) / 1000
+            budget *= options['scale']
+            flag = '' if spent <= budget else '  OVER'
+            if flag:
+                over.append(package)
+            self.stdout.write(f"{package:<28}{spent:>10.1f}{budget:>10.0f}{flag}")
+        self.stdout.write(f"{'(total imports)':<28}{sum(per_package.values()) / 1000:>10.1f}")
+
+        self.stdout.write("\nModules les plus lents (temps propre) :")
+        slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:options['top']]
+        for name, (self_us, cumulative_us, _depth) in slowest:
+            self.stdout.write(f"  {self_us / 1000:>8.1f} ms  {cumulative_us / 1000:>8.1f} ms cumul  {name}")
+
+        self.stdout.write(f"\nChargement de {options['module']} : {report['load'] * 1000:.0f} ms")
+        for name, seconds in report['preload'].items():
+            self.stdout.write(f"  préchargement {name:<16}{seconds * 1000:>8.1f} ms")
+
+        if over:
+            raise CommandError(f"Budget d'import dépassé : {', '.join(over)}")
+        self.stdout.write(self.style.SUCCESS("Budgets d'import respectés"))
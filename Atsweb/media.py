@@ -0,0 +1,119 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def serve_protected_file(request, fieldfile, filename=None):
+    """
+    Return a response delivering ``fieldfile`` once the caller has authorized the request,
+    downloaded as ``filename`` (default: the stored name).
+
+    In production the front server sends the bytes (``X-Accel-Redirect`` for nginx,
+    ``X-Sendfile`` for Apache/lighttpd); otherwise the file is streamed by Django.
+    """
+    content_type = mimetypes.guess_type(fieldfile.name)[0] or 'application/octet-stream'
+    filename = filename or os.path.basename(fieldfile.name)
+    mode = settings.PROTECTED_MEDIA_SERVER
+
+    if mode == 'nginx':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(settings.PROTECTED_MEDIA_INTERNAL_URL + fieldfile.name)
+    elif mode == 'sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = fieldfile.path
+    else:
+        response = serve_file(request, fieldfile.path, content_type)
+    # Quoted and escaped, RFC 5987 filename* for non-ASCII names
+    response['Content-Disposition'] = content_disposition_header(False, filename)
+    return response
+
+
+def _file_iterator(handle, start, length):
+    with handle:
+        handle.seek(start)
+        while length > 0:
+            data = handle.read(min(CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def _range_applies(request, etag, last_modified):
+    """If-Range: only honour Range when the client's copy is still current."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _parse_range(header, size):
+    """
+    (start, end) of a single byte range; None when there is no usable Range header
+    (absent or invalid: ignored, full response), False when it is well-formed but
+    cannot be satisfied (416).
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+        return (start, end) if start < size else False
+    if last:
+        # Suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            return False
+        return max(size - int(last), 0), size - 1
+    return None
+
+
+def serve_file(request, path, content_type):
+    """Pure-Python delivery with conditional GET and single byte-range support."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404("File not found")
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        byte_range = _parse_range(request.META.get('HTTP_RANGE', ''), size)
+        if byte_range is not None and not _range_applies(request, etag, last_modified):
+            byte_range = None
+
+        if byte_range is None:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        elif byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        else:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _file_iterator(open(path, 'rb'), start, length),
+                status=206, content_type=content_type,
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(length)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
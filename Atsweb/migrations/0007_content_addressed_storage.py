@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:15
+
+import Atsweb.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Atsweb', '0006_alter_candidature_start_month'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidature',
+            name='cv',
+            field=models.FileField(blank=True, null=True, storage=Atsweb.storage.content_addressed_storage, upload_to='candidatures/cv/'),
+        ),
+        migrations.AlterField(
+            model_name='realisation',
+            name='img',
+            field=models.ImageField(storage=Atsweb.storage.content_addressed_storage, upload_to='realisations/'),
+        ),
+        migrations.AlterField(
+            model_name='service',
+            name='img',
+            field=models.ImageField(storage=Atsweb.storage.content_addressed_storage, upload_to='services/'),
+        ),
+        migrations.AlterField(
+            model_name='temoignage',
+            name='img',
+            field=models.ImageField(blank=True, storage=Atsweb.storage.content_addressed_storage, upload_to='temoignages/'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Atsweb', '0009_sync_tombstones'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='heure_cree',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='realisation',
+            name='heure_cree',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='service',
+            name='heure_cree',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='temoignage',
+            name='heure_cree',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='candidature',
+            index=models.Index(fields=['application_type', '-created_at'], name='Atsweb_cand_applica_4b67dd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidature',
+            index=models.Index(fields=['-created_at'], name='Atsweb_cand_created_412c64_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role'], name='Atsweb_user_role_baddcd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_active'], name='Atsweb_user_is_acti_de01d6_idx'),
+        ),
+    ]
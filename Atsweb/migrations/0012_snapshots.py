@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Atsweb', '0011_stat_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Snapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=50)),
+                ('shape', models.CharField(max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('sort_key', models.DateTimeField()),
+                ('data', models.TextField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model', 'shape', '-sort_key'], name='Atsweb_snap_model_ceab3b_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model', 'shape', 'object_id'), name='unique_snapshot')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Atsweb', '0013_user_date_joined_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(choices=[('login', 'Login'), ('login_failed', 'Login failed'), ('logout', 'Logout'), ('suspend', 'Suspend'), ('activate', 'Activate'), ('set_admin', 'Set admin')], max_length=20)),
+                ('user_id', models.BigIntegerField(blank=True, null=True)),
+                ('actor_id', models.BigIntegerField(blank=True, null=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='Atsweb_audi_created_8b3815_idx'), models.Index(fields=['user_id', 'created_at'], name='Atsweb_audi_user_id_87f97b_idx'), models.Index(fields=['event', 'created_at'], name='Atsweb_audi_event_08af59_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Atsweb', '0015_outbound_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidature',
+            name='cv_filename',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
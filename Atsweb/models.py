@@ -3,6 +3,12 @@ from django.contrib.auth.models import AbstractUser
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.html import linebreaks, strip_tags
+from django.utils.text import Truncator
+
+from .storage import content_addressed_storage
 
 USER_ROLES = (
     ('guest', 'Guest'),
@@ -26,6 +32,14 @@ class User(AbstractUser):
 
     USERNAME_FIELD = 'username'
     REQUIRED_FIELDS = ['email']  # email required for createsuperuser
+
+    class Meta(AbstractUser.Meta):
+        # Admin list filters, sign-up date ranges (exports, stats, rollups)
+        indexes = [
+            models.Index(fields=['role']),
+            models.Index(fields=['is_active']),
+            models.Index(fields=['date_joined']),
+        ]
     
     @property
     def is_predefined_admin(self):
@@ -42,20 +56,29 @@ class Candidature(models.Model):
     ]
 
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name='candidatures')
-    cv = models.FileField(upload_to='candidatures/cv/', blank=True, null=True)
+    cv = models.FileField(upload_to='candidatures/cv/', storage=content_addressed_storage, blank=True, null=True)
+    # Name of the uploaded file (the stored one is its content hash), used for downloads
+    cv_filename = models.CharField(max_length=255, blank=True)
     application_type = models.CharField(max_length=20, choices=APPLICATION_TYPES, default='stage')
     start_month = models.CharField(max_length=50, blank=True)  # e.g., "Janvier 2026"
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Admin change list: filter by type, newest first
+        indexes = [
+            models.Index(fields=['application_type', '-created_at']),
+            models.Index(fields=['-created_at']),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.application_type} - {self.start_month}"
 
 class Service(models.Model):
     titre = models.CharField(max_length=100)
-    img = models.ImageField(upload_to='services/')
+    img = models.ImageField(upload_to='services/', storage=content_addressed_storage)
     description = models.TextField()
-    heure_cree = models.DateTimeField(auto_now_add=True)
-    heure_modifiee = models.DateTimeField(auto_now=True)
+    heure_cree = models.DateTimeField(auto_now_add=True, db_index=True)
+    heure_modifiee = models.DateTimeField(auto_now=True, db_index=True)
     auteur = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
 
     def __str__(self):
@@ -71,12 +94,12 @@ class Technology(models.Model):
 
 class Realisation(models.Model):
     titre = models.CharField(max_length=100)
-    img = models.ImageField(upload_to='realisations/')
+    img = models.ImageField(upload_to='realisations/', storage=content_addressed_storage)
     description = models.TextField()
     client = models.CharField(max_length=100)
     technologies = models.ManyToManyField(Technology)
-    heure_cree = models.DateTimeField(auto_now_add=True)
-    heure_modifiee = models.DateTimeField(auto_now=True)
+    heure_cree = models.DateTimeField(auto_now_add=True, db_index=True)
+    heure_modifiee = models.DateTimeField(auto_now=True, db_index=True)
     auteur = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
 
     def __str__(self):
@@ -84,23 +107,191 @@ class Realisation(models.Model):
 
 
 class Article(models.Model):
+    WORDS_PER_MINUTE = 200
+    EXCERPT_LENGTH = 280
+    DERIVED_FIELDS = ['excerpt', 'description_html', 'word_count', 'reading_time']
+
     titre = models.CharField(max_length=100)
     description = models.TextField()
-    heure_cree = models.DateTimeField(auto_now_add=True)
-    heure_modifiee = models.DateTimeField(auto_now=True)
+    # Derived from description on save (see compute_derived_fields)
+    excerpt = models.CharField(max_length=300, blank=True, editable=False)
+    description_html = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False)  # minutes
+    heure_cree = models.DateTimeField(auto_now_add=True, db_index=True)
+    heure_modifiee = models.DateTimeField(auto_now=True, db_index=True)
     auteur = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
 
     def __str__(self):
         return self.titre
 
+    def compute_derived_fields(self):
+        text = strip_tags(self.description or '').strip()
+        # linebreaks() escapes the text: the stored HTML is safe to render as-is
+        self.description_html = linebreaks(text, autoescape=True)
+        self.excerpt = Truncator(' '.join(text.split())).chars(self.EXCERPT_LENGTH)
+        self.word_count = len(text.split())
+        self.reading_time = -(-self.word_count // self.WORDS_PER_MINUTE)
+
+    def save(self, *args, **kwargs):
+        self.compute_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'description' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | set(self.DERIVED_FIELDS)
+        super().save(*args, **kwargs)
+
 
 class Temoignage(models.Model):
     nom = models.CharField(max_length=100)
     description = models.TextField()
-    img = models.ImageField(upload_to='temoignages/', blank=True)
-    heure_cree = models.DateTimeField(auto_now_add=True)
-    heure_modifiee = models.DateTimeField(auto_now=True)
+    img = models.ImageField(upload_to='temoignages/', storage=content_addressed_storage, blank=True)
+    heure_cree = models.DateTimeField(auto_now_add=True, db_index=True)
+    heure_modifiee = models.DateTimeField(auto_now=True, db_index=True)
     auteur = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
 
     def __str__(self):
         return self.nom
+
+
+class Tombstone(models.Model):
+    """Trace d'une suppression, pour que /api/sync/ puisse la propager aux clients"""
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['model', 'deleted_at'])]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id}"
+
+
+class StatRollup(models.Model):
+    """
+    Compteurs journaliers pré-agrégés pour les graphiques du tableau de bord.
+    Maintenus par les signaux et reconstruits par la commande rebuild_rollups.
+    """
+    metric = models.CharField(max_length=30)       # 'users', 'candidatures', 'content'
+    dimension = models.CharField(max_length=30, blank=True)  # application_type, model...
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'day', 'dimension'], name='unique_stat_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}/{self.dimension} {self.day}: {self.count}"
+
+
+class Snapshot(models.Model):
+    """
+    JSON déjà sérialisé d'un objet public, pour une forme donnée ('list' ou 'detail').
+    Les listes sont assemblées en concaténant ``data`` dans l'ordre de ``sort_key``.
+    """
+    model = models.CharField(max_length=50)
+    shape = models.CharField(max_length=10)
+    object_id = models.BigIntegerField()
+    sort_key = models.DateTimeField()  # heure_cree of the object
+    data = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'shape', 'object_id'], name='unique_snapshot'),
+        ]
+        indexes = [models.Index(fields=['model', 'shape', '-sort_key'])]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} ({self.shape})"
+
+
+class AuditEvent(models.Model):
+    """
+    Journal d'audit en ajout seul (connexions, déconnexions, suspensions, rôles).
+    Pas de clé étrangère et created_at en tête des index : la table peut être
+    partitionnée par date et purgée par partition.
+    """
+    EVENTS = [
+        ('login', 'Login'),
+        ('login_failed', 'Login failed'),
+        ('logout', 'Logout'),
+        ('suspend', 'Suspend'),
+        ('activate', 'Activate'),
+        ('set_admin', 'Set admin'),
+    ]
+
+    event = models.CharField(max_length=20, choices=EVENTS)
+    user_id = models.BigIntegerField(null=True, blank=True)   # user concerned
+    actor_id = models.BigIntegerField(null=True, blank=True)  # who did it (admin actions)
+    ip_address = models.GenericIPAddressField(blank=True, null=True)
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['user_id', 'created_at']),
+            models.Index(fields=['event', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event} {self.user_id} {self.created_at}"
+
+
+class OutboundEmail(models.Model):
+    """
+    File d'attente des emails sortants, envoyés par lots par la commande
+    send_mail_queue (voir mailqueue.py) au lieu de l'être pendant la requête.
+    """
+    STATUSES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=30)  # e.g. "verification"
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUSES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The worker's poll: pending messages that are due
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} -> {self.to_email} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Clé Idempotency-Key d'une création (voir idempotency.py). La contrainte
+    d'unicité réserve la clé : deux requêtes simultanées ne peuvent pas créer
+    deux objets. ``status`` reste vide tant que l'original est en cours.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    scope = models.CharField(max_length=50)  # endpoint (viewset basename)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)  # sha256 of the payload
+    status = models.PositiveSmallIntegerField(null=True, blank=True)
+    data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    headers = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'scope', 'key'], name='unique_idempotency_key'),
+        ]
+        indexes = [models.Index(fields=['created_at'])]
+
+    def __str__(self):
+        return f"{self.scope} {self.user_id} {self.key}"
@@ -47,3 +47,11 @@ class IsOwnerOrAdmin(BasePermission):
         return request.user.is_authenticated and (
             getattr(request.user, 'role', None) == 'admin' or obj.auteur == request.user
         )
+
+
+class IsAdminRole(BasePermission):
+    """
+    Permission réservée aux administrateurs (role == 'admin'), quelle que soit la méthode
+    """
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and getattr(request.user, 'role', None) == 'admin'
@@ -0,0 +1,108 @@
+"""
+EXPLAIN plan capture for the querysets behind the API list endpoints.
+
+Each case builds the queryset a view really runs (through the viewset's own
+get_queryset) plus its paginated/filtered variants. Plans are normalized (costs,
+row estimates and node ids removed) and fingerprinted so a committed baseline can
+be compared on every run; see the check_query_plans command.
+"""
+import hashlib
+import re
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from . import views
+from .exports import export_queryset
+from .models import AuditEvent, Candidature, OutboundEmail, Snapshot, StatRollup, Tombstone
+
+User = get_user_model()
+
+PAGE = 50
+DEEP_OFFSET = 10000
+
+
+def viewset_queryset(viewset_class, action='list'):
+    """The queryset ``viewset_class`` would run for ``action``, as an admin."""
+    request = Request(APIRequestFactory().get('/'))
+    request.user = User(pk=1, username='plan', role='admin')
+    view = viewset_class(action=action, request=request, format_kwarg=None, kwargs={})
+    return view.get_queryset()
+
+
+def _list_cases(name, viewset_class, allow_seq_scan=False):
+    base = lambda: viewset_queryset(viewset_class)  # noqa: E731
+    return [
+        (f'{name}.list', base, allow_seq_scan),
+        (f'{name}.list.page', lambda: base()[:PAGE], allow_seq_scan),
+        (f'{name}.list.deep_page', lambda: base()[DEEP_OFFSET:DEEP_OFFSET + PAGE], allow_seq_scan),
+    ]
+
+
+def get_cases():
+    """[(name, queryset factory, seq scan allowed)]"""
+    since = timezone.now() - timedelta(days=1)
+    return [
+        # Full-table listings: reading every row is the point
+        *_list_cases('users', views.UserViewSet, allow_seq_scan=True),
+        *_list_cases('technologies', views.TechnologyViewSet, allow_seq_scan=True),
+        *_list_cases('candidatures', views.CandidatureViewSet),
+        *_list_cases('services', views.ServiceViewSet),
+        *_list_cases('realisations', views.RealisationViewSet),
+        *_list_cases('articles', views.ArticleViewSet),
+        *_list_cases('temoignages', views.TemoignageViewSet),
+        ('users.filter.role', lambda: User.objects.filter(role='admin'), False),
+        ('users.filter.email', lambda: User.objects.filter(email='plan@example.com'), False),
+        ('users.export.since', lambda: export_queryset('users', since=since.date()), False),
+        ('candidatures.filter.type', lambda: Candidature.objects.filter(
+            application_type='stage').order_by('-created_at')[:PAGE], False),
+        ('candidatures.export.since', lambda: export_queryset('candidatures', since=since.date()), False),
+        ('sync.services', lambda: viewset_queryset(views.ServiceViewSet).filter(heure_modifiee__gt=since), False),
+        ('sync.articles', lambda: viewset_queryset(views.ArticleViewSet).filter(heure_modifiee__gt=since), False),
+        ('sync.tombstones', lambda: Tombstone.objects.filter(model='article', deleted_at__gt=since), False),
+        ('snapshots.list', lambda: Snapshot.objects.filter(
+            model='realisation', shape='list').order_by('-sort_key'), False),
+        ('rollups.range', lambda: StatRollup.objects.filter(metric='users', day__gte=since.date()), False),
+        ('audit.user', lambda: AuditEvent.objects.filter(user_id=1).order_by('-created_at')[:PAGE], False),
+        ('audit.event', lambda: AuditEvent.objects.filter(event='login').order_by('-created_at')[:PAGE], False),
+        ('mailqueue.due', lambda: OutboundEmail.objects.filter(
+            status='pending', next_attempt_at__lte=since).order_by('next_attempt_at')[:100], False),
+    ]
+
+
+def normalize(plan):
+    lines = []
+    for line in plan.splitlines():
+        if connection.vendor == 'sqlite':
+            line = re.sub(r'^\d+ \d+ \d+ ', '', line)  # node ids
+        else:
+            line = re.sub(r'\s*\(cost=[^)]*\)', '', line)
+            line = re.sub(r'\s*\(actual[^)]*\)', '', line)
+        line = line.rstrip()
+        if line.strip():
+            lines.append(line)
+    return lines
+
+
+def has_seq_scan(lines):
+    if connection.vendor == 'sqlite':
+        return any(re.match(r'^\s*SCAN \S+$', line) for line in lines)
+    return any('Seq Scan on' in line for line in lines)
+
+
+def capture():
+    """{case name: {'fingerprint', 'plan', 'seq_scan', 'allow_seq_scan'}}"""
+    results = {}
+    for name, factory, allow_seq_scan in get_cases():
+        lines = normalize(factory().explain())
+        results[name] = {
+            'fingerprint': hashlib.sha1('\n'.join(lines).encode()).hexdigest()[:16],
+            'plan': lines,
+            'seq_scan': has_seq_scan(lines),
+            'allow_seq_scan': allow_seq_scan,
+        }
+    return results
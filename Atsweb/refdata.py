@@ -0,0 +1,113 @@
+"""
+Reference data (small, rarely written tables such as Technology) kept in process
+memory.
+
+Each worker holds a full copy of the table tagged with a version token stored in
+the shared Django cache. Every access compares the token (one cache read instead
+of a database query) and reloads on mismatch; writes replace the token once the
+transaction commits (see signals.py), which invalidates every worker.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from rest_framework import relations
+
+from .models import Technology
+
+
+class ReferenceCache:
+    def __init__(self, model, ordering=('pk',)):
+        self.model = model
+        self.ordering = ordering
+        self.version_key = f'refdata:{model._meta.label_lower}'
+        # (version, rows, {pk: row}), replaced as a whole so readers never see a mix
+        self.state = (None, [], {})
+
+    def current_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            # Evicted or never set: publish one, keep whichever won the race
+            cache.add(self.version_key, uuid.uuid4().hex, None)
+            version = cache.get(self.version_key)
+        return version
+
+    def _load(self):
+        # Read the version before the rows: a concurrent write then forces a reload
+        version = self.current_version()
+        state = self.state
+        if version is not None and version == state[0]:
+            return state
+        rows = list(self.model.objects.order_by(*self.ordering))
+        self.state = state = (version, rows, {row.pk: row for row in rows})
+        return state
+
+    def all(self):
+        return self._load()[1]
+
+    def get(self, pk):
+        return self._load()[2].get(pk)
+
+    def get_many(self, pks):
+        """{pk: instance} for the pks present in the cache."""
+        by_pk = self._load()[2]
+        return {pk: by_pk[pk] for pk in pks if pk in by_pk}
+
+    def invalidate(self):
+        cache.set(self.version_key, uuid.uuid4().hex, None)
+        self.state = (None, [], {})
+
+
+technology_cache = ReferenceCache(Technology, ordering=('name',))
+
+
+class BatchedManyRelatedField(relations.ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_internal_values(data)
+
+
+class ReferencePrimaryKeyRelatedField(relations.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField whose ``many=True`` form validates every submitted id
+    at once: against ``reference`` (a ReferenceCache), then with a single ``IN``
+    query for the ids it does not know yet, instead of one query per id.
+    """
+
+    def __init__(self, reference=None, **kwargs):
+        self.reference = reference
+        super().__init__(**kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in relations.MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
+
+    def to_internal_values(self, data):
+        queryset = self.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for value in data:
+            if self.pk_field is not None:
+                value = self.pk_field.to_internal_value(value)
+            try:
+                if isinstance(value, bool):
+                    raise TypeError
+                pks.append(pk_field.to_python(value))
+            except (TypeError, ValueError, ValidationError):
+                self.fail('incorrect_type', data_type=type(value).__name__)
+
+        found = self.reference.get_many(pks) if self.reference is not None else {}
+        missing = [pk for pk in pks if pk not in found]
+        if missing:
+            found.update(queryset.in_bulk(missing))
+        for pk in pks:
+            if pk not in found:
+                self.fail('does_not_exist', pk_value=pk)
+        return [found[pk] for pk in pks]
@@ -0,0 +1,99 @@
+from datetime import datetime, time
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Service, Realisation, Article, Temoignage, Candidature, StatRollup
+
+User = get_user_model()
+
+CONTENT_MODELS = [Service, Realisation, Article, Temoignage]
+
+# metric -> [(model, date field, dimension expression)]
+SOURCES = {
+    'users': [(User, 'date_joined', Value(''))],
+    'candidatures': [(Candidature, 'created_at', F('application_type'))],
+    'content': [(model, 'heure_cree', Value(model._meta.model_name)) for model in CONTENT_MODELS],
+}
+
+TRUNCATE = {'day': None, 'week': TruncWeek, 'month': TruncMonth}
+
+
+def rollup_key(instance):
+    """(metric, dimension, date field) for a model instance, or None if not tracked."""
+    if isinstance(instance, User):
+        return 'users', '', instance.date_joined
+    if isinstance(instance, Candidature):
+        return 'candidatures', instance.application_type, instance.created_at
+    if isinstance(instance, tuple(CONTENT_MODELS)):
+        return 'content', instance._meta.model_name, instance.heure_cree
+    return None
+
+
+def bump(metric, dimension, moment, delta):
+    """Add ``delta`` to the day bucket of ``moment`` (one UPDATE in the common case)."""
+    lookup = {'metric': metric, 'dimension': dimension, 'day': timezone.localdate(moment)}
+    if StatRollup.objects.filter(**lookup).update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            StatRollup.objects.create(count=delta, **lookup)
+    except IntegrityError:
+        # Created concurrently by another worker
+        StatRollup.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def rebuild(since=None):
+    """
+    Recompute the closed days (before today) from the raw tables and replace
+    the matching rollup rows. Returns the number of rows written.
+    """
+    end = datetime.combine(timezone.localdate(), time.min, tzinfo=timezone.get_current_timezone())
+    start = None
+    if since:
+        start = datetime.combine(since, time.min, tzinfo=timezone.get_current_timezone())
+
+    rows = []
+    for metric, sources in SOURCES.items():
+        for model, date_field, dimension in sources:
+            queryset = model.objects.filter(**{f'{date_field}__lt': end})
+            if start:
+                queryset = queryset.filter(**{f'{date_field}__gte': start})
+            grouped = (
+                queryset.annotate(rollup_day=TruncDate(date_field), rollup_dimension=dimension)
+                .values('rollup_day', 'rollup_dimension')
+                .annotate(total=Count('pk'))
+                .order_by()
+            )
+            rows.extend(
+                StatRollup(metric=metric, dimension=row['rollup_dimension'], day=row['rollup_day'], count=row['total'])
+                for row in grouped
+            )
+
+    with transaction.atomic():
+        stale = StatRollup.objects.filter(day__lt=end.date())
+        if start:
+            stale = stale.filter(day__gte=start.date())
+        stale.delete()
+        StatRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def timeseries(metric, interval='day', since=None, until=None):
+    """Buckets for ``metric`` read from the rollup table only."""
+    queryset = StatRollup.objects.filter(metric=metric)
+    if since:
+        queryset = queryset.filter(day__gte=since)
+    if until:
+        queryset = queryset.filter(day__lte=until)
+    truncate = TRUNCATE[interval]
+    period = truncate('day') if truncate else F('day')
+    return list(
+        queryset.annotate(period=period)
+        .values('period', 'dimension')
+        .annotate(count=Sum('count'))
+        .order_by('period', 'dimension')
+    )
@@ -1,10 +1,16 @@
+import os
+
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from rest_framework.validators import UniqueValidator
-from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import make_password
 
-from .models import Service, Technology, Realisation, Article, Temoignage, Candidature
+from .models import Service, Technology, Realisation, Article, Temoignage, Candidature, AuditEvent
+from .refdata import ReferencePrimaryKeyRelatedField, technology_cache
+from .verification import enqueue_verification
 
 User = get_user_model()
 
@@ -26,17 +32,28 @@ class UserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         password = validated_data.pop("password")
-        user = User.objects.create_user(password=password, **validated_data)
+        # Every signup route (register, POST /api/users/) sends the verification email;
+        # no account without its queued email, and no email for an account rolled back
+        with transaction.atomic():
+            user = User.objects.create_user(password=password, **validated_data)
+            enqueue_verification(user)
         return user
 
     def update(self, instance, validated_data):
         password = validated_data.pop('password', None)
         if password:
             instance.set_password(password)
-        
+
+        email_changed = 'email' in validated_data and validated_data['email'] != instance.email
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        with transaction.atomic():
+            if email_changed:
+                # The new address has to be confirmed again (older links stop matching)
+                instance.is_verified = False
+            instance.save()
+            if email_changed:
+                enqueue_verification(instance)
         return instance
 
 
@@ -47,6 +64,8 @@ class UserListSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "email", "role", "is_active", "is_verified", "date_joined", "status"]
+        # Columns read by get_status (Atsweb/valueserializers.py)
+        values_dependencies = {"status": ["is_active"]}
     
     def get_status(self, obj):
         return "Actif" if obj.is_active else "Suspendu"
@@ -62,7 +81,12 @@ class MyTokenObtainPairSerializer(serializers.Serializer):
         password = attrs.get("password")
 
         user = User.objects.filter(email=email).first()
-        if not user or not check_password(password, user.password):
+        if not user:
+            # Hash anyway so an unknown email takes as long as a wrong password
+            make_password(password)
+            raise serializers.ValidationError("Email ou mot de passe incorrect")
+        # user.check_password re-hashes and saves when the stored hash is outdated
+        if not user.check_password(password):
             raise serializers.ValidationError("Email ou mot de passe incorrect")
 
         if not user.is_active:
@@ -79,23 +103,58 @@ class MyTokenObtainPairSerializer(serializers.Serializer):
         }
 
 # candidatures/serializers.py
+class ProtectedCVField(serializers.FileField):
+    """Upload like a FileField, but point to the authorized download endpoint, never to MEDIA_URL"""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = reverse('candidature-cv', kwargs={'pk': value.instance.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
 class CandidatureSerializer(serializers.ModelSerializer):
     user_username = serializers.CharField(source='user.username', read_only=True)
+    cv = ProtectedCVField(required=False, allow_null=True)
 
     class Meta:
         model = Candidature
-        fields = ['id', 'user', 'user_username', 'cv', 'application_type', 'start_month', 'created_at']
+        fields = ['id', 'user', 'user_username', 'cv', 'cv_filename', 'application_type', 'start_month', 'created_at']
         extra_kwargs = {
             'user': {'write_only': True},  # Only used for writing, not returned in response
             'created_at': {'read_only': True},
+            'cv_filename': {'read_only': True},
         }
 
     def create(self, validated_data):
         # Automatically set the user to the authenticated user
         if 'user' not in validated_data and self.context.get('request'):
             validated_data['user'] = self.context['request'].user
+        if validated_data.get('cv'):
+            validated_data['cv_filename'] = os.path.basename(validated_data['cv'].name)[:255]
         return Candidature.objects.create(**validated_data)
 
+    def update(self, instance, validated_data):
+        if 'cv' in validated_data:
+            cv = validated_data['cv']
+            validated_data['cv_filename'] = os.path.basename(cv.name)[:255] if cv else ''
+        return super().update(instance, validated_data)
+
+    def find_duplicate(self, user):
+        """
+        Existing candidature of ``user`` with the same type and an identical CV.
+        The storage names files after their content hash, so this is one lookup.
+        """
+        cv = self.validated_data.get('cv')
+        if not cv:
+            return None
+        field = Candidature._meta.get_field('cv')
+        name = field.storage.hashed_name(field.generate_filename(None, cv.name), cv)
+        application_type = self.validated_data.get(
+            'application_type', Candidature._meta.get_field('application_type').default)
+        return Candidature.objects.filter(user=user, application_type=application_type, cv=name).first()
+
 # --- Content Serializers ---
 class ServiceSerializer(serializers.ModelSerializer):
     auteur_username = serializers.CharField(source='auteur.username', read_only=True)
@@ -128,8 +187,9 @@ class TechnologySerializer(serializers.ModelSerializer):
 
 class RealisationSerializer(serializers.ModelSerializer):
     technologies_names = serializers.StringRelatedField(source='technologies', many=True, read_only=True)
-    technology_ids = serializers.PrimaryKeyRelatedField(
-        many=True, queryset=Technology.objects.all(), 
+    # All ids validated at once against the in-process technology cache
+    technology_ids = ReferencePrimaryKeyRelatedField(
+        many=True, queryset=Technology.objects.all(), reference=technology_cache,
         write_only=True, source='technologies', required=False
     )
     auteur_username = serializers.CharField(source='auteur.username', read_only=True)
@@ -190,7 +250,7 @@ class ArticleListSerializer(serializers.ModelSerializer):
     auteur_username = serializers.CharField(source='auteur.username', read_only=True)
     class Meta:
         model = Article
-        fields = ["id", "titre", "auteur_username", "heure_cree", "description"]
+        fields = ["id", "titre", "auteur_username", "heure_cree", "excerpt", "reading_time"]
 
 
 class TemoignageSerializer(serializers.ModelSerializer):
@@ -223,4 +283,11 @@ class DashboardStatsSerializer(serializers.Serializer):
     total_services = serializers.IntegerField()
     total_realisations = serializers.IntegerField()
     total_temoignages = serializers.IntegerField()
-    recent_users = serializers.IntegerField()  # users registered in last 30 days
\ No newline at end of file
+    recent_users = serializers.IntegerField()  # users registered in last 30 days
+
+
+# --- Audit log ---
+class AuditEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuditEvent
+        fields = ["id", "event", "user_id", "actor_id", "ip_address", "data", "created_at"]
@@ -0,0 +1,191 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, ProgrammingError, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .events import broadcaster
+from .rollups import bump, rollup_key
+from . import snapshots
+from .refdata import technology_cache
+from . import sitemaps
+from .models import Service, Realisation, Article, Temoignage, Candidature, Technology, Tombstone
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+CONTENT_MODELS = [Service, Realisation, Article, Temoignage]
+DASHBOARD_MODELS = CONTENT_MODELS + [User, Candidature]
+
+
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=Realisation)
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Temoignage)
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.model_name, object_id=instance.pk)
+
+
+def notify_dashboards(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    if 'created' in kwargs:
+        action = 'created' if kwargs['created'] else 'updated'
+    else:
+        action = 'deleted'
+    data = {'model': sender._meta.model_name, 'id': instance.pk, 'action': action}
+
+    def publish():
+        broadcaster.mark_stats_dirty()
+        broadcaster.publish('change', data)
+
+    # Dashboards refetch on notification: only tell them once the data is visible
+    transaction.on_commit(publish)
+
+
+for model in DASHBOARD_MODELS:
+    post_save.connect(notify_dashboards, sender=model, dispatch_uid=f'notify_save_{model.__name__}')
+    post_delete.connect(notify_dashboards, sender=model, dispatch_uid=f'notify_delete_{model.__name__}')
+
+
+# Fields whose previous value the post_save receivers below compare against
+TRACKED_FIELDS = {User: ['username'], Candidature: ['application_type']}
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Candidature)
+def remember_previous_values(sender, instance, raw=False, update_fields=None, **kwargs):
+    # One query, only for updates that may change a tracked field (not last_login saves)
+    fields = TRACKED_FIELDS[sender]
+    instance._previous_values = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    instance._previous_values = sender.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+def bump_on_commit(changes):
+    """
+    Apply rollup ``changes`` [(metric, dimension, moment, delta)] once the save
+    commits. Failures are only logged: migrations save users (0002) before the
+    rollup table exists, and rebuild_rollups repairs a missed bump.
+    """
+    def apply():
+        try:
+            with transaction.atomic():
+                for change in changes:
+                    bump(*change)
+        except (OperationalError, ProgrammingError) as exc:
+            logger.warning("Rollup update skipped: %s", exc)
+
+    transaction.on_commit(apply)
+
+
+def update_rollups(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    key = rollup_key(instance)
+    if key is None or key[2] is None:
+        return
+    metric, dimension, moment = key
+    if 'created' not in kwargs:
+        bump_on_commit([(metric, dimension, moment, -1)])
+    elif kwargs['created']:
+        bump_on_commit([(metric, dimension, moment, 1)])
+    elif sender is Candidature:
+        # The count moves with the candidature when its type changes
+        previous = getattr(instance, '_previous_values', None)
+        if previous and previous['application_type'] != dimension:
+            bump_on_commit([
+                (metric, previous['application_type'], moment, -1),
+                (metric, dimension, moment, 1),
+            ])
+
+
+for model in DASHBOARD_MODELS:
+    post_save.connect(update_rollups, sender=model, dispatch_uid=f'rollup_save_{model.__name__}')
+    post_delete.connect(update_rollups, sender=model, dispatch_uid=f'rollup_delete_{model.__name__}')
+
+
+# --- Pre-serialized snapshots (see snapshots.py) ---
+def refresh_snapshot(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        snapshots.schedule_refresh(sender, [instance.pk])
+
+
+def delete_snapshot(sender, instance, **kwargs):
+    snapshots.delete(sender, instance.pk)
+
+
+for model in CONTENT_MODELS:
+    post_save.connect(refresh_snapshot, sender=model, dispatch_uid=f'snapshot_save_{model.__name__}')
+    post_delete.connect(delete_snapshot, sender=model, dispatch_uid=f'snapshot_delete_{model.__name__}')
+
+
+@receiver(m2m_changed, sender=Realisation.technologies.through)
+def refresh_realisation_technologies(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        snapshots.schedule_refresh(Realisation, [instance.pk])
+    elif pk_set:
+        snapshots.schedule_refresh(Realisation, pk_set)
+    else:
+        snapshots.schedule_refresh(Realisation, Realisation.objects.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Technology)
+def refresh_technology_realisations(sender, instance, created, **kwargs):
+    if not created and not kwargs.get('raw'):
+        snapshots.schedule_refresh(Realisation, instance.realisation_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Technology)
+@receiver(pre_delete, sender=User)
+def refresh_dependent_snapshots(sender, instance, **kwargs):
+    # The links are removed by the deletion (M2M rows, auteur SET_NULL) without
+    # signals: capture the affected objects now, refreshed once committed.
+    if sender is Technology:
+        affected = {Realisation: list(instance.realisation_set.values_list('pk', flat=True))}
+    else:
+        affected = {
+            model: list(model.objects.filter(auteur=instance).values_list('pk', flat=True))
+            for model in CONTENT_MODELS
+        }
+    for model, pks in affected.items():
+        if pks:
+            snapshots.schedule_refresh(model, pks)
+
+
+@receiver(post_save, sender=User)
+def refresh_authored_snapshots(sender, instance, created, **kwargs):
+    # auteur_username is part of every snapshot: refresh only on a rename
+    previous = getattr(instance, '_previous_values', None)
+    if created or kwargs.get('raw') or not previous or previous['username'] == instance.username:
+        return
+    for model in CONTENT_MODELS:
+        pks = list(model.objects.filter(auteur=instance).values_list('pk', flat=True))
+        if pks:
+            snapshots.schedule_refresh(model, pks)
+
+
+# --- Reference data cache (see refdata.py) ---
+@receiver(post_save, sender=Technology)
+@receiver(post_delete, sender=Technology)
+def invalidate_technology_cache(sender, instance, **kwargs):
+    transaction.on_commit(technology_cache.invalidate)
+
+
+# --- Sitemap and feed stamps (see sitemaps.py) ---
+def touch_sitemap(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        pk = instance.pk
+        transaction.on_commit(lambda: sitemaps.touch(sender, pk))
+
+
+for model in sitemaps.SECTION_MODELS:
+    post_save.connect(touch_sitemap, sender=model, dispatch_uid=f'sitemap_save_{model.__name__}')
+    post_delete.connect(touch_sitemap, sender=model, dispatch_uid=f'sitemap_delete_{model.__name__}')
@@ -0,0 +1,215 @@
+"""
+sitemap.xml and the articles RSS/Atom feeds for crawlers and feed readers.
+
+Sections are split into chunks of SITEMAP_CHUNK_SIZE primary keys
+(``/sitemap-articles-3.xml`` lists pks 2*size+1 .. 3*size). Every change stamps
+its section and its chunk in the shared cache (signals.py), so:
+
+- a conditional GET (If-None-Match / If-Modified-Since) is answered 304 from the
+  cache stamps alone, without a database query;
+- a document is rebuilt only when a stamp it depends on has moved; unchanged
+  chunks and sections keep being served from the cache.
+
+Stamps expire after SITEMAP_STAMP_TTL, which also bounds how long changes made
+without signals (bulk updates) can go unnoticed.
+"""
+import hashlib
+import time
+from io import StringIO
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import Http404, HttpResponse
+from django.utils import feedgenerator
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from .models import Article, Service, Realisation
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+FEED_ITEMS = 50
+
+# section: (model, front-end path of one object)
+SECTIONS = {
+    'articles': (Article, '/articles/{pk}'),
+    'services': (Service, '/services/{pk}'),
+    'realisations': (Realisation, '/realisations/{pk}'),
+}
+SECTION_MODELS = {model: section for section, (model, _path) in SECTIONS.items()}
+
+
+def chunk_of(pk):
+    return (pk - 1) // settings.SITEMAP_CHUNK_SIZE + 1
+
+
+def _section_key(section):
+    return f'sitemap:stamp:{section}'
+
+
+def _chunk_key(section, chunk):
+    return f'sitemap:stamp:{section}:{chunk}'
+
+
+def get_stamps(keys):
+    """{key: unix time of the last change}; missing stamps start now (forces a rebuild)."""
+    stamps = cache.get_many(keys)
+    missing = [key for key in keys if key not in stamps]
+    if missing:
+        now = time.time()
+        for key in missing:
+            cache.add(key, now, settings.SITEMAP_STAMP_TTL)
+        stamps.update(cache.get_many(missing))
+        stamps.update({key: now for key in missing if key not in stamps})
+    return stamps
+
+
+def touch(model, pk):
+    """Record a change of ``model`` #``pk`` (called once the transaction commits)."""
+    section = SECTION_MODELS.get(model)
+    if section is None:
+        return
+    now = time.time()
+    cache.set_many({_section_key(section): now, _chunk_key(section, chunk_of(pk)): now},
+                   settings.SITEMAP_STAMP_TTL)
+
+
+def _absolute(path):
+    return settings.SITE_URL.rstrip('/') + path
+
+
+def _w3c(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ') if moment else None
+
+
+def _xml(root, attrs, entries):
+    """<root xmlns=...><sitemap|url><loc/>[<lastmod/>]</...>...</root>"""
+    out = StringIO()
+    xml = SimplerXMLGenerator(out, 'utf-8', short_empty_elements=True)
+    xml.startDocument()
+    xml.startElement(root, attrs)
+    child = 'sitemap' if root == 'sitemapindex' else 'url'
+    for loc, lastmod in entries:
+        xml.startElement(child, {})
+        xml.addQuickElement('loc', loc)
+        if lastmod:
+            xml.addQuickElement('lastmod', lastmod)
+        xml.endElement(child)
+    xml.endElement(root)
+    return out.getvalue().encode()
+
+
+def last_chunk(section, stamps=None):
+    """Number of the last chunk of ``section`` (0 when empty), cached until the section changes."""
+    stamp_key = _section_key(section)
+    stamp = (stamps or get_stamps([stamp_key]))[stamp_key]
+    key = f'sitemap:last:{section}:{stamp}'
+    last = cache.get(key)
+    if last is None:
+        max_pk = SECTIONS[section][0].objects.aggregate(max_pk=Max('pk'))['max_pk']
+        last = chunk_of(max_pk) if max_pk else 0
+        cache.set(key, last, settings.SITEMAP_STAMP_TTL)
+    return last
+
+
+def build_index(stamps):
+    chunks = {section: range(1, last_chunk(section, stamps) + 1) for section in SECTIONS}
+    chunk_stamps = cache.get_many([
+        _chunk_key(section, chunk) for section, numbers in chunks.items() for chunk in numbers
+    ])
+    entries = []
+    for section, numbers in chunks.items():
+        for chunk in numbers:
+            stamp = chunk_stamps.get(_chunk_key(section, chunk), stamps[_section_key(section)])
+            entries.append((
+                _absolute(f'/sitemap-{section}-{chunk}.xml'),
+                _w3c(datetime.fromtimestamp(stamp, dt_timezone.utc)),
+            ))
+    return _xml('sitemapindex', {'xmlns': SITEMAP_NS}, entries)
+
+
+def build_chunk(section, chunk):
+    model, path = SECTIONS[section]
+    size = settings.SITEMAP_CHUNK_SIZE
+    rows = (
+        model.objects.filter(pk__gt=(chunk - 1) * size, pk__lte=chunk * size)
+        .order_by('pk').values_list('pk', 'heure_modifiee')
+    )
+    return _xml('urlset', {'xmlns': SITEMAP_NS}, (
+        (_absolute(path.format(pk=pk)), _w3c(modified)) for pk, modified in rows
+    ))
+
+
+def build_feed(feed_format):
+    feed_class = feedgenerator.Atom1Feed if feed_format == 'atom' else feedgenerator.Rss201rev2Feed
+    articles = (
+        Article.objects.select_related('auteur').order_by('-heure_cree')
+        .only('pk', 'titre', 'excerpt', 'heure_cree', 'heure_modifiee', 'auteur__username')[:FEED_ITEMS]
+    )
+    feed = feed_class(
+        title=settings.FEED_TITLE,
+        link=_absolute('/articles'),
+        description=settings.FEED_TITLE,
+        feed_url=_absolute(f'/feeds/articles.{feed_format}'),
+        language='fr',
+    )
+    for article in articles:
+        link = _absolute(SECTIONS['articles'][1].format(pk=article.pk))
+        feed.add_item(
+            title=article.titre,
+            link=link,
+            unique_id=link,
+            description=article.excerpt,
+            author_name=article.auteur.username if article.auteur else None,
+            pubdate=article.heure_cree,
+            updateddate=article.heure_modifiee,
+        )
+    return feed.writeString('utf-8').encode(), feed.content_type
+
+
+def serve_document(request, name, stamp_keys, build):
+    """
+    Conditional response for the cached document ``name``: 304 from the stamps
+    alone, cached bytes while the stamps are unchanged, else ``build()`` once.
+    ``build`` returns (bytes, content type).
+    """
+    stamps = get_stamps(stamp_keys)
+    version = hashlib.sha1(repr((name, [stamps[key] for key in stamp_keys])).encode()).hexdigest()[:16]
+    etag = f'"{version}"'
+    last_modified = int(max(stamps.values()))
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        doc_key = f'sitemap:doc:{name}:{version}'
+        document = cache.get(doc_key)
+        if document is None:
+            document = build(stamps)
+            cache.set(doc_key, document, settings.SITEMAP_STAMP_TTL)
+        body, content_type = document
+        response = HttpResponse(body, content_type=content_type)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = f'public, max-age={settings.SITEMAP_MAX_AGE}'
+    return response
+
+
+def sitemap_index(request):
+    keys = [_section_key(section) for section in SECTIONS]
+    return serve_document(request, 'index', keys, lambda stamps: (
+        build_index(stamps), 'application/xml; charset=utf-8'))
+
+
+def sitemap_chunk(request, section, chunk):
+    # Only existing chunks: arbitrary numbers must not each get a cache entry
+    if section not in SECTIONS or not 1 <= chunk <= last_chunk(section):
+        raise Http404
+    keys = [_chunk_key(section, chunk)]
+    return serve_document(request, f'{section}:{chunk}', keys, lambda stamps: (
+        build_chunk(section, chunk), 'application/xml; charset=utf-8'))
+
+
+def articles_feed(request, feed_format):
+    keys = [_section_key('articles')]
+    return serve_document(request, f'feed:{feed_format}', keys, lambda stamps: build_feed(feed_format))
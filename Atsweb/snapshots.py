@@ -0,0 +1,168 @@
+"""
+Read model for the public content: each object's serialized JSON is stored per
+serializer shape and list responses are assembled from the stored strings.
+
+Image URLs are stored relative (MEDIA_URL/...) and made absolute for the current
+request when the response is assembled, exactly like the live serializers do.
+
+Signal-driven refreshes run once the transaction commits, and every save of the
+same transaction is folded into a single refresh per model (schedule_refresh):
+an admin save with inlines re-serializes each object once, not once per row.
+"""
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from .models import Service, Realisation, Article, Temoignage, Snapshot
+from .serializers import (
+    ServiceSerializer, ServiceListSerializer, RealisationSerializer, RealisationListSerializer,
+    ArticleSerializer, ArticleListSerializer, TemoignageSerializer, TemoignageListSerializer,
+)
+
+SHAPES = {
+    Service: {'list': ServiceListSerializer, 'detail': ServiceSerializer},
+    Realisation: {'list': RealisationListSerializer, 'detail': RealisationSerializer},
+    Article: {'list': ArticleListSerializer, 'detail': ArticleSerializer},
+    Temoignage: {'list': TemoignageListSerializer, 'detail': TemoignageSerializer},
+}
+
+FILE_FIELDS = ['img']
+
+renderer = JSONRenderer()
+
+
+def snapshot_queryset(model):
+    queryset = model.objects.select_related('auteur')
+    if model is Realisation:
+        queryset = queryset.prefetch_related('technologies')
+    return queryset
+
+
+def render(instance, serializer_class):
+    # Same renderer as the API responses: identical bytes
+    return renderer.render(serializer_class(instance).data).decode()
+
+
+def build_snapshots(instances):
+    rows = []
+    for instance in instances:
+        for shape, serializer_class in SHAPES[type(instance)].items():
+            rows.append(Snapshot(
+                model=instance._meta.model_name, shape=shape, object_id=instance.pk,
+                sort_key=instance.heure_cree, data=render(instance, serializer_class),
+            ))
+    return rows
+
+
+def refresh(model, pks):
+    """(Re)write the snapshots of the given objects of ``model``."""
+    instances = list(snapshot_queryset(model).filter(pk__in=pks))
+    rows = build_snapshots(instances)
+    with transaction.atomic():
+        Snapshot.objects.filter(model=model._meta.model_name, object_id__in=pks).delete()
+        Snapshot.objects.bulk_create(rows)
+
+
+class PendingRefresh:
+    """on_commit callback refreshing every object scheduled during the transaction."""
+
+    def __init__(self):
+        self.pks = defaultdict(set)
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        for model, pks in self.pks.items():
+            refresh(model, sorted(pks))
+
+
+def schedule_refresh(model, pks):
+    """Refresh the snapshots of ``pks`` after commit, batched per transaction."""
+    connection = transaction.get_connection()
+    pending = getattr(connection, 'snapshot_refresh', None)
+    # Already run, or dropped by a rollback with what it had collected: start a new one
+    if (pending is None or pending.done
+            or not any(callback is pending for _, callback, _ in connection.run_on_commit)):
+        pending = connection.snapshot_refresh = PendingRefresh()
+        pending.pks[model].update(pks)
+        transaction.on_commit(pending)  # runs right away outside a transaction
+    else:
+        pending.pks[model].update(pks)
+
+
+def delete(model, pk):
+    Snapshot.objects.filter(model=model._meta.model_name, object_id=pk).delete()
+
+
+def rebuild(model, batch_size=500):
+    """Rebuild every snapshot of ``model``; returns the number of objects."""
+    name = model._meta.model_name
+    total = 0
+    with transaction.atomic():
+        Snapshot.objects.filter(model=name).delete()
+        batch = []
+        for instance in snapshot_queryset(model).iterator(chunk_size=batch_size):
+            batch.append(instance)
+            if len(batch) >= batch_size:
+                Snapshot.objects.bulk_create(build_snapshots(batch))
+                total += len(batch)
+                batch = []
+        if batch:
+            Snapshot.objects.bulk_create(build_snapshots(batch))
+            total += len(batch)
+    return total
+
+
+def absolutize(data, request):
+    """Relative media URLs -> absolute ones, as serializers do when given the request."""
+    prefix = request.build_absolute_uri(settings.MEDIA_URL)
+    for field in FILE_FIELDS:
+        data = data.replace(f'"{field}":"{settings.MEDIA_URL}', f'"{field}":"{prefix}')
+    return data
+
+
+def assemble_list(model, request):
+    """
+    JSON array of the list shape, newest first, or None when the snapshots do not
+    cover every row yet (fresh deploy before rebuild_snapshots): callers then fall
+    back to the live serializer.
+    """
+    name = model._meta.model_name
+    rows = list(
+        Snapshot.objects.filter(model=name, shape='list')
+        .order_by('-sort_key').values_list('data', flat=True)
+    )
+    if len(rows) != model.objects.count():
+        return None
+    return absolutize('[' + ','.join(rows) + ']', request)
+
+
+def assemble_detail(model, pk, request):
+    data = (
+        Snapshot.objects.filter(model=model._meta.model_name, shape='detail', object_id=pk)
+        .values_list('data', flat=True).first()
+    )
+    return absolutize(data, request) if data is not None else None
+
+
+def check(model):
+    """Compare stored snapshots with the live serializers; returns the mismatches."""
+    stored = {
+        (shape, object_id): data
+        for shape, object_id, data in Snapshot.objects.filter(model=model._meta.model_name)
+        .values_list('shape', 'object_id', 'data')
+    }
+    problems = []
+    for instance in snapshot_queryset(model).iterator(chunk_size=500):
+        for shape, serializer_class in SHAPES[model].items():
+            data = stored.pop((shape, instance.pk), None)
+            if data is None:
+                problems.append((shape, instance.pk, 'missing'))
+            # Both sides without a request: media URLs relative, see absolutize()
+            elif json.loads(data) != json.loads(render(instance, serializer_class)):
+                problems.append((shape, instance.pk, 'stale'))
+    problems.extend((shape, object_id, 'orphan') for shape, object_id in stored)
+    return problems
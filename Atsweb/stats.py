@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .models import Service, Realisation, Article, Temoignage
+
+User = get_user_model()
+
+
+def dashboard_stats():
+    """Totals shown on the admin dashboard (DashboardStatsView and the event stream)"""
+    thirty_days_ago = timezone.now() - timedelta(days=30)
+
+    return {
+        'total_users': User.objects.count(),
+        'total_articles': Article.objects.count(),
+        'total_services': Service.objects.count(),
+        'total_realisations': Realisation.objects.count(),
+        'total_temoignages': Temoignage.objects.count(),
+        'recent_users': User.objects.filter(date_joined__gte=thirty_days_ago).count(),
+        'active_users': User.objects.filter(is_active=True).count(),
+        'suspended_users': User.objects.filter(is_active=False).count(),
+    }
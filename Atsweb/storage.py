@@ -0,0 +1,58 @@
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+
+HASHED_NAME_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk if isinstance(chunk, bytes) else chunk.encode())
+    content.seek(0)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stockage par empreinte de contenu : ``<upload_to>/<ab>/<sha256><ext>``.
+
+    Un même fichier envoyé deux fois n'est écrit qu'une seule fois et le contenu
+    derrière une URL ne change jamais, ce qui permet au serveur frontal de servir
+    MEDIA_URL avec ``Cache-Control: public, max-age=31536000, immutable``.
+    """
+
+    def hashed_name(self, name, content):
+        directory, filename = os.path.split(name)
+        stem = os.path.splitext(filename)[0]
+        if HASHED_NAME_RE.match(stem) and os.path.basename(directory) == stem[:2]:
+            # Already content-addressed: keep the original upload directory
+            directory = os.path.dirname(directory)
+        digest = content_hash(content)
+        ext = os.path.splitext(filename)[1].lower()
+        return os.path.join(directory, digest[:2], f"{digest}{ext}").replace('\\', '/')
+
+    def _save(self, name, content):
+        # ``name`` may already carry a random suffix from get_available_name(),
+        # only its directory and extension are kept.
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            return name
+        saved = super()._save(name, content)
+        if saved != name:
+            # Lost a race against an identical upload: keep the first copy
+            self.delete(saved)
+        return name
+
+
+_storage = None
+
+
+def content_addressed_storage():
+    """Callable used as ``storage=`` on the model fields (keeps migrations stable)."""
+    global _storage
+    if _storage is None:
+        _storage = ContentAddressedStorage()
+    return _storage
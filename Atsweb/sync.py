@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.utils import timezone
+
+from .models import Service, Realisation, Article, Temoignage, Tombstone
+from .serializers import (
+    ServiceListSerializer, RealisationListSerializer, ArticleListSerializer, TemoignageListSerializer
+)
+
+# Rows saved by a transaction that committed late can carry a heure_modifiee slightly
+# older than the token handed out meanwhile: re-send that margin (clients upsert by id).
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# section -> (queryset, serializer); same shapes as the list endpoints
+SYNC_SECTIONS = {
+    'services': (lambda: Service.objects.select_related('auteur'), ServiceListSerializer),
+    'realisations': (
+        lambda: Realisation.objects.select_related('auteur').prefetch_related('technologies'),
+        RealisationListSerializer,
+    ),
+    'articles': (
+        lambda: Article.objects.select_related('auteur').defer('description', 'description_html'),
+        ArticleListSerializer,
+    ),
+    'temoignages': (lambda: Temoignage.objects.select_related('auteur'), TemoignageListSerializer),
+}
+
+
+def make_token(moment):
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_token(token):
+    """Return the aware datetime encoded in ``token``, or raise ValueError."""
+    return datetime.fromtimestamp(int(token) / 1_000_000, tz=dt_timezone.utc)
+
+
+class SyncExpired(Exception):
+    """The token predates the tombstone retention: deletions may be missing, resync fully."""
+
+
+def tombstone_cutoff(now=None):
+    return (now or timezone.now()) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def changed_ids(since):
+    """
+    {section: ids changed after ``since``}, {section: ids deleted since then},
+    in a single UNION ALL query over the heure_modifiee / deleted_at indexes.
+    """
+    models = {section: queryset_factory().model for section, (queryset_factory, _serializer) in SYNC_SECTIONS.items()}
+    sections = {model._meta.model_name: section for section, model in models.items()}
+    queries = [
+        model.objects.filter(heure_modifiee__gt=since).order_by()
+        .annotate(sync_deleted=Value(False), sync_model=Value(model._meta.model_name))
+        .values_list('sync_deleted', 'sync_model', 'pk')
+        for model in models.values()
+    ]
+    queries.append(
+        Tombstone.objects.filter(model__in=list(sections), deleted_at__gt=since)
+        .order_by().annotate(sync_deleted=Value(True), sync_model=F('model'))
+        .values_list('sync_deleted', 'sync_model', 'object_id')
+    )
+    changed = {section: [] for section in SYNC_SECTIONS}
+    deleted = {section: [] for section in SYNC_SECTIONS}
+    for is_deleted, model_name, pk in queries[0].union(*queries[1:], all=True):
+        (deleted if is_deleted else changed)[sections[model_name]].append(pk)
+    return changed, deleted
+
+
+def collect_changes(since=None, context=None):
+    """
+    Rows modified after ``since`` (everything when None) plus ids deleted since then.
+    An up-to-date client costs one query (changed_ids); only the sections with
+    changes are then loaded. Raises SyncExpired for a token older than the
+    tombstone retention.
+    """
+    now = timezone.now()
+    changes, deleted = {}, {}
+    if since is None:
+        for section, (queryset_factory, serializer_class) in SYNC_SECTIONS.items():
+            queryset = queryset_factory().order_by('heure_modifiee')
+            changes[section] = serializer_class(queryset, many=True, context=context).data
+        return {'token': make_token(now), 'changes': changes, 'deleted': deleted}
+
+    if since < tombstone_cutoff(now):
+        raise SyncExpired
+    changed, deleted = changed_ids(since - SYNC_OVERLAP)
+    for section, (queryset_factory, serializer_class) in SYNC_SECTIONS.items():
+        if changed[section]:
+            queryset = queryset_factory().filter(pk__in=changed[section]).order_by('heure_modifiee')
+            changes[section] = serializer_class(queryset, many=True, context=context).data
+        else:
+            changes[section] = []
+    return {'token': make_token(now), 'changes': changes, 'deleted': deleted}
@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM)
+class UserAdminActionTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.staff = User.objects.create_superuser('staff', 'staff@example.com', 'x')
+        self.users = [User.objects.create_user(f'user{i}', f'user{i}@example.com', 'x') for i in range(2)]
+        self.predefined = User.objects.get(username='superadmin')  # created by a data migration
+        self.client.force_login(self.staff)
+        self.saved = []
+        post_save.connect(self.record_save, sender=User)
+        self.addCleanup(post_save.disconnect, self.record_save, sender=User)
+
+    def record_save(self, sender, instance, update_fields=None, **kwargs):
+        self.saved.append((instance.pk, update_fields))
+
+    def run_action(self, action, users):
+        with mock.patch('Atsweb.admin.audit') as audit:
+            self.client.post('/admin/Atsweb/user/', {
+                'action': action, '_selected_action': [user.pk for user in users],
+            })
+        return audit
+
+    def test_suspend_saves_and_audits_each_user(self):
+        audit = self.run_action('suspend_users', [*self.users, self.predefined])
+        for user in self.users:
+            user.refresh_from_db()
+            self.assertFalse(user.is_active)
+        self.predefined.refresh_from_db()
+        self.assertTrue(self.predefined.is_active)
+        self.assertEqual(sorted(self.saved), sorted((user.pk, frozenset({'is_active'})) for user in self.users))
+        self.assertEqual([c.args[0] for c in audit.call_args_list], ['suspend', 'suspend'])
+
+    def test_activate_skips_active_users(self):
+        self.users[0].is_active = False
+        self.users[0].save()
+        self.saved.clear()
+        audit = self.run_action('activate_users', self.users)
+        self.users[0].refresh_from_db()
+        self.assertTrue(self.users[0].is_active)
+        self.assertEqual(self.saved, [(self.users[0].pk, frozenset({'is_active'}))])
+        self.assertEqual(audit.call_count, 1)
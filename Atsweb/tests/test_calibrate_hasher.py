@@ -0,0 +1,22 @@
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+
+class CalibrateHasherTests(SimpleTestCase):
+    def test_measures_candidates_without_touching_settings(self):
+        before = (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM)
+        out = StringIO()
+        call_command('calibrate_hasher', '--max-time-cost', '2', '--memory', '1024',
+                     '--parallelism', '1', '--samples', '1', '--target-ms', '100000', stdout=out)
+        self.assertIn('time_cost= 2 memory=1024 KiB', out.getvalue())
+        self.assertIn('ARGON2_MEMORY_COST=1024', out.getvalue())
+        self.assertEqual(before, (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM))
+
+    def test_clear_error_without_argon2(self):
+        with mock.patch('importlib.util.find_spec', return_value=None):
+            with self.assertRaisesMessage(CommandError, 'argon2-cffi'):
+                call_command('calibrate_hasher', stdout=StringIO())
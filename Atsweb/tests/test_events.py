@@ -0,0 +1,94 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from Atsweb import events
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+ORIGIN = 'http://localhost:5173'
+
+
+def call_stream(query=b'', method='GET', headers=()):
+    """(status, headers, body) of one /api/events/ request, disconnecting after the snapshot."""
+    scope = {
+        'type': 'http', 'method': method, 'path': '/api/events/',
+        'query_string': query, 'headers': [(b'origin', ORIGIN.encode()), *headers],
+    }
+    messages = []
+
+    async def run():
+        first_body = asyncio.Event()
+
+        async def receive():
+            await first_body.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            messages.append(message)
+            if message['type'] == 'http.response.body':
+                first_body.set()
+
+        await asyncio.wait_for(events.sse_application(scope, receive, send), 5)
+
+    async_to_sync(run)()
+    start = messages[0]
+    body = b''.join(m.get('body', b'') for m in messages[1:])
+    return start['status'], dict(start['headers']), body
+
+
+# Inside a test transaction, closing "old" connections would drop the test's own
+@mock.patch('Atsweb.events.close_old_connections')
+@override_settings(CACHES=LOCMEM, CORS_ALLOWED_ORIGINS=[ORIGIN], CORS_ALLOW_CREDENTIALS=True)
+class EventStreamTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'x', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def ticket(self):
+        response = self.client.post('/api/events/ticket/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['ticket']
+
+    def test_ticket_opens_one_stream_only(self, close_old_connections):
+        query = f'ticket={self.ticket()}'.encode()
+        status, headers, body = call_stream(query)
+        self.assertEqual(status, 200)
+        self.assertTrue(body.startswith(b'event: stats'))
+        self.assertEqual(call_stream(query)[0], 401)
+
+    def test_access_token_in_query_string_is_refused(self, close_old_connections):
+        self.assertEqual(call_stream(b'token=anything')[0], 401)
+
+    def test_ticket_requires_admin(self, close_old_connections):
+        user = get_user_model().objects.create_user('user', 'user@example.com', 'x')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.post('/api/events/ticket/').status_code, 403)
+
+    def test_cors_headers_for_allowed_origin(self, close_old_connections):
+        status, headers, _ = call_stream(f'ticket={self.ticket()}'.encode())
+        self.assertEqual(headers[b'access-control-allow-origin'], ORIGIN.encode())
+        self.assertEqual(headers[b'access-control-allow-credentials'], b'true')
+        # Errors carry them too, so the browser can read the status
+        status, headers, _ = call_stream()
+        self.assertEqual(status, 401)
+        self.assertEqual(headers[b'access-control-allow-origin'], ORIGIN.encode())
+
+    def test_unknown_origin_gets_no_cors_headers(self, close_old_connections):
+        with self.settings(CORS_ALLOWED_ORIGINS=['https://example.com']):
+            _, headers, _ = call_stream()
+        self.assertNotIn(b'access-control-allow-origin', headers)
+
+    def test_preflight(self, close_old_connections):
+        status, headers, _ = call_stream(method='OPTIONS')
+        self.assertEqual(status, 204)
+        self.assertIn(b'authorization', headers[b'access-control-allow-headers'])
+
+    def test_stats_release_stale_connections(self, close_old_connections):
+        events.run_as_request(lambda: None)
+        self.assertEqual(close_old_connections.call_count, 2)
@@ -0,0 +1,75 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from Atsweb.models import Candidature, IdempotencyKey
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM, IDEMPOTENCY_TTL=3600)
+class IdempotentCreateTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = override_settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = get_user_model().objects.create_user('candidate', 'candidate@example.com', 'x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, key=None, application_type='stage', content=b'%PDF-1.4 cv'):
+        cv = SimpleUploadedFile('cv.pdf', content, content_type='application/pdf')
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        return self.client.post('/api/candidatures/', {
+            'cv': cv, 'user': self.user.pk, 'application_type': application_type,
+        }, format='multipart', **headers)
+
+    def test_retry_replays_the_first_response(self):
+        first = self.post('abc')
+        self.assertEqual(first.status_code, 201)
+        retry = self.post('abc')
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Candidature.objects.count(), 1)
+
+    def test_same_key_with_another_payload_is_refused(self):
+        self.post('abc')
+        self.assertEqual(self.post('abc', application_type='emploi').status_code, 422)
+
+    def test_key_still_being_processed_gets_409(self):
+        IdempotencyKey.objects.create(user=self.user, scope='candidature', key='abc', fingerprint='x')
+        self.assertEqual(self.post('abc').status_code, 409)
+
+    def test_abandoned_or_expired_keys_are_taken_again(self):
+        long_ago = timezone.now() - timedelta(hours=2)
+        IdempotencyKey.objects.create(user=self.user, scope='candidature', key='abc', fingerprint='x',
+                                      created_at=long_ago)
+        self.assertEqual(self.post('abc').status_code, 201)
+        out = StringIO()
+        IdempotencyKey.objects.update(created_at=long_ago)
+        call_command('purge_idempotency_keys', stdout=out)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_failed_request_frees_the_key(self):
+        self.client.post('/api/candidatures/', {'application_type': 'inconnu'},
+                         format='multipart', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_resubmitted_candidature_answers_200(self):
+        first = self.post()
+        again = self.post()
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.json()['id'], first.json()['id'])
+        # A replay of a 200 stays a 200
+        self.assertEqual(self.post('abc').status_code, 200)
+        self.assertEqual(self.post('abc').status_code, 200)
@@ -0,0 +1,59 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase
+
+User = get_user_model()
+
+
+class ImportUsersTests(TestCase):
+    def setUp(self):
+        self.password_hash = make_password('secret123')
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def import_rows(self, rows):
+        path = os.path.join(self.directory.name, 'users.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.DictWriter(handle, fieldnames=['username', 'email', 'password_hash', 'role'])
+            writer.writeheader()
+            for username, email in rows:
+                writer.writerow({'username': username, 'email': email,
+                                 'password_hash': self.password_hash, 'role': 'guest'})
+        out, err = StringIO(), StringIO()
+        call_command('import_users', path, workers=1, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_creates_users_and_skips_duplicates_in_file(self):
+        self.import_rows([('alice', 'alice@example.com'), ('alice2', 'Alice@example.com'), ('bob', 'bob@example.com')])
+        self.assertEqual(
+            sorted(User.objects.filter(username__in=['alice', 'alice2', 'bob']).values_list('username', flat=True)),
+            ['alice', 'bob'],
+        )
+
+    def test_existing_email_matches_case_insensitively(self):
+        User.objects.create_user(username='alice', email='alice@example.com', password='x')
+        self.import_rows([('alice_new', 'ALICE@example.com')])
+        self.assertFalse(User.objects.filter(username='alice_new').exists())
+
+    def test_integrity_error_falls_back_to_row_inserts(self):
+        real_bulk_create = User.objects.bulk_create
+
+        def bulk_create(users, **kwargs):
+            if len(users) > 1 or users[0].username == 'carol':
+                raise IntegrityError("duplicate key")
+            return real_bulk_create(users, **kwargs)
+
+        with mock.patch.object(User.objects, 'bulk_create', side_effect=bulk_create):
+            out, err = self.import_rows([('carol', 'carol@example.com'), ('dave', 'dave@example.com')])
+        self.assertTrue(User.objects.filter(username='dave').exists())
+        self.assertFalse(User.objects.filter(username='carol').exists())
+        self.assertIn('carol', err)
+        self.assertIn('1 utilisateurs créés, 1 lignes ignorées', out)
@@ -0,0 +1,104 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from Atsweb.media import _parse_range, serve_file
+
+User = get_user_model()
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_valid_ranges(self):
+        self.assertEqual(_parse_range('bytes=2-4', 10), (2, 4))
+        self.assertEqual(_parse_range('bytes=8-', 10), (8, 9))
+        self.assertEqual(_parse_range('bytes=5-100', 10), (5, 9))
+        self.assertEqual(_parse_range('bytes=-3', 10), (7, 9))
+        self.assertEqual(_parse_range('bytes=-30', 10), (0, 9))
+
+    def test_invalid_ranges_are_ignored(self):
+        for header in ('', 'bytes=-', 'bytes=5-3', 'bytes=a-b', 'items=0-1', 'bytes=0-1,3-4'):
+            self.assertIsNone(_parse_range(header, 10), header)
+
+    def test_unsatisfiable_ranges(self):
+        self.assertIs(_parse_range('bytes=10-', 10), False)
+        self.assertIs(_parse_range('bytes=-0', 10), False)
+        self.assertIs(_parse_range('bytes=-5', 0), False)
+
+
+class ServeFileTests(SimpleTestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.write(handle, b'0123456789')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        self.factory = RequestFactory()
+
+    def get(self, **headers):
+        return serve_file(self.factory.get('/', **headers), self.path, 'application/octet-stream')
+
+    def test_full_and_partial_responses(self):
+        self.assertEqual(b''.join(self.get().streaming_content), b'0123456789')
+        response = self.get(HTTP_RANGE='bytes=2-4')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-4/10')
+        self.assertEqual(b''.join(response.streaming_content), b'234')
+
+    def test_malformed_range_gets_full_body(self):
+        response = self.get(HTTP_RANGE='bytes=-')
+        self.assertEqual(response.status_code, 200)
+
+    def test_unsatisfiable_range(self):
+        response = self.get(HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_if_range_mismatch_ignores_range(self):
+        response = self.get(HTTP_RANGE='bytes=2-4', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_get(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_missing_file_is_404(self):
+        with self.assertRaises(Http404):
+            serve_file(self.factory.get('/'), self.path + '.missing', 'application/pdf')
+
+
+class CandidatureCVTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = override_settings(MEDIA_ROOT=media.name, PROTECTED_MEDIA_SERVER='')
+        override.enable()
+        self.addCleanup(override.disable)
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='secret123')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='secret123')
+        self.client = APIClient()
+
+    def upload(self):
+        self.client.force_authenticate(self.owner)
+        cv = SimpleUploadedFile('Mon CV été.pdf', b'%PDF-1.4 cv', content_type='application/pdf')
+        response = self.client.post('/api/candidatures/', {'cv': cv, 'user': self.owner.pk, 'application_type': 'stage'}, format='multipart')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def test_serializer_points_to_protected_endpoint(self):
+        data = self.upload()
+        self.assertTrue(data['cv'].endswith(f"/api/candidatures/{data['id']}/cv/"))
+        self.assertEqual(data['cv_filename'], 'Mon CV été.pdf')
+
+    def test_download_uses_original_name_and_checks_owner(self):
+        data = self.upload()
+        response = self.client.get(data['cv'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 cv')
+        self.assertIn("filename*=utf-8''Mon%20CV%20%C3%A9t%C3%A9.pdf", response['Content-Disposition'])
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(data['cv']).status_code, 404)
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from Atsweb.models import Article
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM, SITEMAP_CHUNK_SIZE=2, SITE_URL='https://example.com')
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.articles = [Article.objects.create(titre=f'Article {i}', description='texte') for i in range(3)]
+
+    def chunk_url(self, chunk):
+        return f'/sitemap-articles-{chunk}.xml'
+
+    def test_index_lists_existing_chunks(self):
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'https://example.com/sitemap-articles-2.xml')
+        self.assertNotContains(response, 'sitemap-articles-3.xml')
+
+    def test_chunk_lists_its_objects(self):
+        response = self.client.get(self.chunk_url(2))
+        self.assertContains(response, f'https://example.com/articles/{self.articles[2].pk}')
+        self.assertNotContains(response, f'/articles/{self.articles[0].pk}<')
+
+    def test_unknown_sections_and_chunks_are_404(self):
+        last = (self.articles[-1].pk - 1) // 2 + 1
+        for url in ('/sitemap-unknown-1.xml', self.chunk_url(0), self.chunk_url(last + 1), self.chunk_url(10 ** 6)):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+
+    def test_conditional_get_is_304_without_queries(self):
+        first = self.client.get('/sitemap.xml')
+        with self.assertNumQueries(0):
+            response = self.client.get('/sitemap.xml', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get('/sitemap.xml', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_change_moves_the_etag(self):
+        url = self.chunk_url(1)
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.articles[0].titre = 'Modifié'
+            self.articles[0].save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_feeds(self):
+        for feed_format in ('rss', 'atom'):
+            response = self.client.get(f'/feeds/articles.{feed_format}')
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'Article 2')
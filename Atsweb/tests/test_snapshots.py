@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from Atsweb import snapshots
+from Atsweb.models import Article, Snapshot
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM)
+class SnapshotRefreshTests(TestCase):
+    def test_saves_of_one_transaction_refresh_once_after_commit(self):
+        with mock.patch('Atsweb.snapshots.refresh', wraps=snapshots.refresh) as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    first = Article.objects.create(titre='Un', description='texte')
+                    second = Article.objects.create(titre='Deux', description='texte')
+                    first.titre = 'Un bis'
+                    first.save()
+                    self.assertEqual(refresh.call_count, 0)
+        refresh.assert_called_once_with(Article, sorted([first.pk, second.pk]))
+        self.assertIn('Un bis', Snapshot.objects.get(object_id=first.pk, shape='detail').data)
+
+    def test_rolled_back_transaction_does_not_swallow_later_refreshes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(titre='Un', description='texte')
+        with self.assertRaises(ValueError), transaction.atomic():
+            article.save()
+            raise ValueError
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            article.titre = 'Après rollback'
+            article.save()
+        self.assertEqual(sum(isinstance(c, snapshots.PendingRefresh) for c in callbacks), 1)
+        self.assertIn('Après rollback', Snapshot.objects.get(object_id=article.pk, shape='detail').data)
+
+    def test_check_reports_stale_and_missing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            fresh = Article.objects.create(titre='À jour', description='texte')
+            stale = Article.objects.create(titre='Ancien', description='texte')
+        self.assertEqual(snapshots.check(Article), [])
+        Article.objects.filter(pk=stale.pk).update(titre='Modifié sans signal')
+        Snapshot.objects.filter(object_id=fresh.pk, shape='list').delete()
+        self.assertEqual(sorted(snapshots.check(Article)), sorted([
+            ('list', fresh.pk, 'missing'), ('list', stale.pk, 'stale'), ('detail', stale.pk, 'stale'),
+        ]))
@@ -0,0 +1,65 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from Atsweb.models import Article, Tombstone
+from Atsweb.sync import make_token
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM, SYNC_TOMBSTONE_RETENTION_DAYS=30)
+class SyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.old = Article.objects.create(titre='Ancien', description='texte')
+        self.gone = Article.objects.create(titre='Supprimé', description='texte')
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Article.objects.update(heure_modifiee=an_hour_ago)
+        self.token = make_token(timezone.now() - timedelta(minutes=1))
+
+    def sync(self, token=None):
+        return self.client.get('/api/sync/', {'since': token} if token else {})
+
+    def test_full_sync_returns_everything(self):
+        data = self.sync().json()
+        self.assertEqual({row['id'] for row in data['changes']['articles']}, {self.old.pk, self.gone.pk})
+        self.assertEqual(data['deleted'], {})
+
+    def test_up_to_date_client_costs_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.sync(self.token).json()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(data['changes']['articles'], [])
+        self.assertEqual(data['deleted']['articles'], [])
+
+    def test_changes_and_deletions_since_token(self):
+        new = Article.objects.create(titre='Nouveau', description='texte')
+        gone_pk = self.gone.pk
+        self.gone.delete()
+        data = self.sync(self.token).json()
+        self.assertEqual([row['id'] for row in data['changes']['articles']], [new.pk])
+        self.assertEqual(data['deleted']['articles'], [gone_pk])
+        self.assertEqual(data['changes']['services'], [])
+
+    def test_token_older_than_retention_is_gone(self):
+        response = self.sync(make_token(timezone.now() - timedelta(days=31)))
+        self.assertEqual(response.status_code, 410)
+        self.assertTrue(response.json()['full_resync'])
+
+    def test_invalid_token(self):
+        self.assertEqual(self.sync('abc').status_code, 400)
+
+    def test_purge_tombstones(self):
+        gone_pk = self.gone.pk
+        self.gone.delete()
+        Tombstone.objects.create(model='article', object_id=999)
+        Tombstone.objects.filter(object_id=999).update(deleted_at=timezone.now() - timedelta(days=40))
+        call_command('purge_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [gone_pk])
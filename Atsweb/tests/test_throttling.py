@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from Atsweb.throttling import SlidingWindowThrottle, parse_rate
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class LoginView:
+    throttle_rules = [('email', '5/min')]
+
+
+@override_settings(CACHES=LOCMEM)
+class SlidingWindowThrottleTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.factory = APIRequestFactory()
+        self.view = LoginView()
+
+    def attempt(self, email='alice@example.com', now=1000.0):
+        request = self.factory.post('/api/auth/login/', {'email': email}, format='json')
+        request.data = {'email': email}
+        throttle = SlidingWindowThrottle()
+        throttle.cache = caches['default']
+        with mock.patch('Atsweb.throttling.time.time', return_value=now):
+            return throttle.allow_request(request, self.view), throttle.wait()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/min'), (5, 60))
+        self.assertEqual(parse_rate('10/h'), (10, 3600))
+
+    def test_blocks_after_limit_per_email(self):
+        results = [self.attempt()[0] for _ in range(6)]
+        self.assertEqual(results, [True] * 5 + [False])
+        # Case and whitespace do not give a fresh counter
+        self.assertFalse(self.attempt(email=' ALICE@example.com ')[0])
+        self.assertTrue(self.attempt(email='bob@example.com')[0])
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(5):
+            self.attempt(now=1000.0)            # window 16, 40s in
+        allowed, wait = self.attempt(now=1030.0)  # window 17, 10s in: 5 * 5/6 + 1 > 5
+        self.assertFalse(allowed)
+        self.assertGreaterEqual(wait, 1)
+        self.assertTrue(self.attempt(now=1075.0)[0])  # 55s in: 5 * 1/12 + 1 < 5
+
+    def test_safe_methods_are_not_counted(self):
+        request = self.factory.get('/api/auth/login/')
+        self.assertTrue(SlidingWindowThrottle().allow_request(request, self.view))
+
+    def test_counter_evicted_between_add_and_incr(self):
+        cache = mock.Mock()
+        cache.add.return_value = False
+        cache.incr.side_effect = ValueError("Key not found")
+        cache.get.return_value = 0
+        request = self.factory.post('/api/auth/login/', {}, format='json')
+        request.data = {'email': 'alice@example.com'}
+        throttle = SlidingWindowThrottle()
+        throttle.cache = cache
+        self.assertTrue(throttle.allow_request(request, self.view))
+        cache.set.assert_called_once()
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from Atsweb import serializers
+from Atsweb.models import Article, Realisation, Service, Technology, Temoignage
+from Atsweb.valueserializers import compile_serializer
+
+User = get_user_model()
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+LIST_SERIALIZERS = [
+    serializers.UserListSerializer, serializers.ServiceListSerializer, serializers.RealisationListSerializer,
+    serializers.ArticleListSerializer, serializers.TemoignageListSerializer,
+]
+DETAIL_SERIALIZERS = [
+    serializers.ServiceSerializer, serializers.RealisationSerializer,
+    serializers.ArticleSerializer, serializers.TemoignageSerializer,
+]
+
+
+@override_settings(CACHES=LOCMEM)
+class ValueSerializerParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('author', 'author@example.com', 'x')
+        User.objects.create_user('suspended', 'suspended@example.com', 'x', is_active=False)
+        django, react = Technology.objects.create(name='Django'), Technology.objects.create(name='React')
+        for auteur in (author, None):  # null foreign key: auteur_username is None
+            Service.objects.create(titre='Service', description='texte', img='services/logo.png', auteur=auteur)
+            Article.objects.create(titre='Article', description='un deux trois', auteur=auteur)
+            Temoignage.objects.create(nom='Client', description='texte', auteur=auteur)
+            Temoignage.objects.create(nom='Sans image', description='texte', img='', auteur=auteur)
+            realisation = Realisation.objects.create(
+                titre='Projet', description='texte', client='ACME', img='realisations/projet.png', auteur=auteur)
+        realisation.technologies.set([react, django])
+        Realisation.objects.create(titre='Sans technologie', description='texte', client='ACME',
+                                   img='realisations/vide.png')
+
+    def assert_parity(self, serializer_class, request=None):
+        compiled = compile_serializer(serializer_class)
+        queryset = serializer_class.Meta.model.objects.order_by('pk')
+        context = {'request': request} if request else {}
+        expected = serializer_class(queryset, many=True, context=context).data
+        self.assertEqual(compiled.serialize(queryset, context=context), [dict(item) for item in expected])
+
+    def test_list_serializers_compile(self):
+        for serializer_class in LIST_SERIALIZERS:
+            self.assertIsNotNone(compile_serializer(serializer_class), serializer_class.__name__)
+
+    def test_same_output_as_drf(self):
+        request = RequestFactory().get('/api/')
+        for serializer_class in LIST_SERIALIZERS + DETAIL_SERIALIZERS:
+            if compile_serializer(serializer_class) is None:
+                continue
+            with self.subTest(serializer_class.__name__):
+                self.assert_parity(serializer_class)
+                self.assert_parity(serializer_class, request)
+
+    def test_same_datetimes_in_another_time_zone(self):
+        with timezone.override('Europe/Paris'):
+            for serializer_class in LIST_SERIALIZERS:
+                with self.subTest(serializer_class.__name__):
+                    self.assert_parity(serializer_class)
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from Atsweb.models import OutboundEmail
+from Atsweb.serializers import UserSerializer
+from Atsweb.verification import check_token, make_token
+
+User = get_user_model()
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM, EMAIL_VERIFICATION_MAX_AGE=3600)
+class VerificationTokenTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'x')
+
+    def test_round_trip(self):
+        self.assertEqual(check_token(make_token(self.user)), self.user)
+
+    def test_tampered_token(self):
+        token = make_token(self.user)
+        self.assertIsNone(check_token(token[:-2] + ('AA' if token[-2:] != 'AA' else 'BB')))
+        forged = signing.dumps({'u': self.user.pk, 'e': self.user.email}, salt='other', compress=True)
+        self.assertIsNone(check_token(forged))
+
+    def test_expired_token(self):
+        token = make_token(self.user)
+        with override_settings(EMAIL_VERIFICATION_MAX_AGE=-1):
+            self.assertIsNone(check_token(token))
+
+    def test_email_change_invalidates_token(self):
+        token = make_token(self.user)
+        self.user.email = 'new@example.com'
+        self.user.save()
+        self.assertIsNone(check_token(token))
+
+    def test_verify_view(self):
+        client = APIClient()
+        response = client.get('/api/auth/verify-email/', {'token': make_token(self.user)})
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_verified)
+        self.assertEqual(client.get('/api/auth/verify-email/', {'token': 'nope'}).status_code, 400)
+
+
+@override_settings(CACHES=LOCMEM)
+class UserSerializerVerificationTests(TestCase):
+    def test_email_change_requires_new_verification(self):
+        user = User.objects.create_user('candidate', 'candidate@example.com', 'x', is_verified=True)
+        serializer = UserSerializer(user, data={'email': 'new@example.com'}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        user.refresh_from_db()
+        self.assertFalse(user.is_verified)
+        self.assertEqual(list(OutboundEmail.objects.values_list('to_email', flat=True)), ['new@example.com'])
+
+    def test_other_changes_keep_verification(self):
+        user = User.objects.create_user('candidate', 'candidate@example.com', 'x', is_verified=True)
+        serializer = UserSerializer(user, data={'username': 'renamed', 'email': 'candidate@example.com'}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        user.refresh_from_db()
+        self.assertTrue(user.is_verified)
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_signup_rolled_back_when_email_cannot_be_queued(self):
+        serializer = UserSerializer(data={'username': 'new', 'email': 'new@example.com', 'password': 'secret123'})
+        serializer.is_valid(raise_exception=True)
+        with mock.patch('Atsweb.serializers.enqueue_verification', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                serializer.save()
+        self.assertFalse(User.objects.filter(username='new').exists())
@@ -0,0 +1,78 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'5/min' -> (5, 60)"""
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Limitation de débit par fenêtre glissante, partagée entre les workers via le cache
+    (Redis dès qu'il y a plusieurs workers : add/incr doivent être atomiques).
+
+    Les règles sont lues sur la vue (``throttle_rules``), par exemple
+    ``[('ip', '20/min'), ('email', '5/min')]`` et configurées par route dans
+    ``config/urls.py``. Seules les requêtes non "safe" sont comptées : ce sont
+    elles qui déclenchent un hachage de mot de passe.
+    """
+    cache = cache
+
+    def get_scope_ident(self, request, scope):
+        if scope == 'ip':
+            return self.get_ident(request)
+        if scope == 'email':
+            email = request.data.get('email') if hasattr(request.data, 'get') else None
+            return str(email).strip().lower() if email else None
+        raise ValueError(f"Unknown throttle scope: {scope}")
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        if request.method in SAFE_METHODS:
+            return True
+
+        now = time.time()
+        for scope, rate in getattr(view, 'throttle_rules', ()):
+            ident = self.get_scope_ident(request, scope)
+            if not ident:
+                continue
+            num_requests, duration = parse_rate(rate)
+            digest = hashlib.sha256(ident.encode()).hexdigest()[:32]
+            prefix = f"throttle:{view.__class__.__name__}:{scope}:{digest}"
+
+            window = int(now // duration)
+            elapsed = (now % duration) / duration
+            current_key = f"{prefix}:{window}"
+            # Two counters per key; the previous window is weighted by how much
+            # of it still overlaps the sliding window.
+            if self.cache.add(current_key, 1, timeout=duration * 2):
+                current = 1
+            else:
+                try:
+                    current = self.cache.incr(current_key)
+                except ValueError:
+                    # Expired or evicted between add() and incr(): the window starts again
+                    self.cache.set(current_key, 1, timeout=duration * 2)
+                    current = 1
+            previous = self.cache.get(f"{prefix}:{window - 1}", 0)
+            estimated = previous * (1 - elapsed) + current
+
+            if estimated > num_requests:
+                if previous:
+                    # Time until enough of the previous window has slid out
+                    wait = ((previous + current - num_requests) / previous - elapsed) * duration
+                else:
+                    wait = (1 - elapsed) * duration
+                self.wait_time = max(self.wait_time or 0, wait, 1)
+        return self.wait_time is None
+
+    def wait(self):
+        return self.wait_time
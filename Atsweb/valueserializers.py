@@ -0,0 +1,262 @@
+"""
+Read-only fast path for list serializers.
+
+``compile_serializer(ListSerializer)`` turns the declared fields of a
+ModelSerializer into one ``values()`` query plus a precomputed row -> dict
+transform, so list responses skip model instantiation and the per-row DRF field
+machinery while producing the same output:
+
+- model fields and ``source='fk.field'`` traversals (forward foreign keys) are read
+  from the row and formatted by the DRF field's own ``to_representation``, except
+  ISO 8601 datetimes, converted with the time zone looked up once per call;
+- file/image fields build the URL from the storage, absolute with the request;
+- primary-key and many-related fields (``StringRelatedField(many=True)``...) are
+  resolved with one extra query per relation;
+- ``SerializerMethodField`` runs the serializer's method on the row, which must
+  declare the columns it reads in ``Meta.values_dependencies``.
+
+Anything else (nested serializers, properties, custom fields) makes the serializer
+not compilable: ``compile_serializer`` returns None and callers use DRF.
+"""
+import logging
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, fields as drf_fields, relations, serializers
+from rest_framework.fields import empty
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+SKIP = object()
+IN_BATCH = 1000
+
+
+class NotCompilable(Exception):
+    pass
+
+
+class Row(dict):
+    """values() row readable as attributes, for SerializerMethodField methods."""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def _missing_behaviour(field):
+    # What DRF does when a dotted source hits a null foreign key (Field.get_attribute)
+    if field.default is not empty:
+        return field.get_default
+    if field.allow_null:
+        return lambda: None
+    if not field.required:
+        return lambda: SKIP
+    raise NotCompilable(f"{field.field_name}: required field across a nullable relation")
+
+
+def _resolve_source(model, source_attrs):
+    """
+    ``['auteur', 'username']`` -> ('auteur__username', model field, nullable FK path
+    prefixes). Only forward FK/one-to-one hops ending on a concrete field.
+    """
+    nullable = []
+    for index, attr in enumerate(source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise NotCompilable(f"{'.'.join(source_attrs)} is not a model field") from None
+        if not model_field.concrete or model_field.many_to_many or model_field.one_to_many:
+            raise NotCompilable(f"{'.'.join(source_attrs)} is not a column")
+        if index < len(source_attrs) - 1:
+            if not model_field.is_relation:
+                raise NotCompilable(f"{'.'.join(source_attrs)} traverses a non-relation")
+            if model_field.null:
+                nullable.append('__'.join(source_attrs[:index + 1]))
+            model = model_field.related_model
+    return '__'.join(source_attrs), model_field, nullable
+
+
+class CompiledSerializer:
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        meta = serializer_class.Meta
+        self.model = meta.model
+        dependencies = getattr(meta, 'values_dependencies', {})
+        self.columns = {'pk'}
+        self.getters = []  # (output name, getter(row, state) -> value | SKIP), in field order
+        self.relations = []  # (output name, child field, through, source/target columns, model)
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in dependencies:
+                    raise NotCompilable(f"{name}: declare its columns in Meta.values_dependencies")
+                self.columns.update(dependencies[name])
+                method = getattr(serializer, field.method_name)
+                self.getters.append((name, self._method_getter(method)))
+            elif isinstance(field, relations.ManyRelatedField):
+                self._add_many_related(name, field)
+                self.getters.append((name, None))  # filled from self.relations
+            elif isinstance(field, serializers.BaseSerializer):
+                raise NotCompilable(f"{name}: nested serializer")
+            elif isinstance(field, relations.PrimaryKeyRelatedField):
+                key, model_field, nullable = _resolve_source(self.model, field.source_attrs)
+                if not model_field.is_relation or nullable:
+                    raise NotCompilable(f"{name}: unsupported primary key source")
+                self.columns.add(key)
+                self.getters.append((name, self._plain_getter(key, lambda value: value)))
+            elif isinstance(field, relations.RelatedField):
+                raise NotCompilable(f"{name}: {type(field).__name__}")
+            else:
+                key, model_field, nullable = _resolve_source(self.model, field.source_attrs)
+                if model_field.is_relation:
+                    raise NotCompilable(f"{name}: relation rendered without a related field")
+                self.columns.add(key)
+                self.columns.update(nullable)
+                if isinstance(field, drf_fields.FileField):
+                    getter = self._file_getter(key, field, model_field)
+                elif self._is_iso_datetime(field):
+                    getter = self._datetime_getter(key)
+                else:
+                    getter = self._plain_getter(key, field.to_representation)
+                if nullable:
+                    getter = self._guarded(getter, nullable, _missing_behaviour(field))
+                self.getters.append((name, getter))
+        self.columns = sorted(self.columns)
+
+    @staticmethod
+    def _is_iso_datetime(field):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        return (type(field) is drf_fields.DateTimeField and not hasattr(field, 'timezone')
+                and output_format is not None and output_format.lower() == ISO_8601)
+
+    @staticmethod
+    def _datetime_getter(key):
+        # DateTimeField.to_representation without its per-value time zone lookup
+        def getter(row, state):
+            value = row[key]
+            if not value:
+                return None
+            tz = state['timezone']
+            if tz is not None:
+                value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+            value = value.isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+        return getter
+
+    @staticmethod
+    def _plain_getter(key, convert):
+        def getter(row, state):
+            value = row[key]
+            return None if value is None else convert(value)
+        return getter
+
+    @staticmethod
+    def _method_getter(method):
+        return lambda row, state: method(Row(row))
+
+    @staticmethod
+    def _file_getter(key, field, model_field):
+        storage = model_field.storage
+        use_url = getattr(field, 'use_url', True)
+
+        def getter(row, state):
+            name = row[key]
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            request = state['request']
+            return request.build_absolute_uri(url) if request is not None else url
+        return getter
+
+    @staticmethod
+    def _guarded(getter, nullable, missing):
+        def guarded(row, state):
+            if any(row[key] is None for key in nullable):
+                return missing()
+            return getter(row, state)
+        return guarded
+
+    def _add_many_related(self, name, field):
+        if field.source_attrs != [field.source] or '.' in field.source:
+            raise NotCompilable(f"{name}: traversal to a many relation")
+        try:
+            model_field = self.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise NotCompilable(f"{name}: {field.source} is not a model field") from None
+        if not (model_field.many_to_many and model_field.concrete):
+            raise NotCompilable(f"{name}: only forward many-to-many relations")
+        if model_field.related_model._meta.ordering:
+            raise NotCompilable(f"{name}: related model with a default ordering")
+        through = model_field.remote_field.through
+        self.relations.append((
+            name, field.child_relation, through,
+            model_field.m2m_field_name() + '_id', model_field.m2m_reverse_field_name() + '_id',
+            model_field.related_model,
+        ))
+
+    def _many_values(self, pks):
+        """{output name: {pk: [rendered related objects]}}"""
+        results = {}
+        for name, child, through, source_column, target_column, related_model in self.relations:
+            links = []
+            for start in range(0, len(pks), IN_BATCH):
+                links.extend(
+                    through.objects.filter(**{f'{source_column}__in': pks[start:start + IN_BATCH]})
+                    # Unique (source, target) index order, as relation.all() returns them
+                    .order_by(source_column, target_column).values_list(source_column, target_column)
+                )
+            related = related_model.objects.in_bulk({target for _, target in links})
+            rendered = {pk: child.to_representation(obj) for pk, obj in related.items()}
+            grouped = {}
+            for source, target in links:
+                grouped.setdefault(source, []).append(rendered[target])
+            results[name] = grouped
+        return results
+
+    def serialize(self, queryset, context=None):
+        """List of dicts, as ``ListSerializer(queryset, many=True, context=context).data``."""
+        context = context or {}
+        state = {
+            'request': context.get('request'),
+            'timezone': timezone.get_current_timezone() if settings.USE_TZ else None,
+        }
+        rows = list(queryset.values(*self.columns))
+        many = self._many_values([row['pk'] for row in rows]) if self.relations else {}
+        getters = self.getters
+        data = []
+        for row in rows:
+            item = {}
+            for name, getter in getters:
+                if getter is None:
+                    item[name] = many[name].get(row['pk'], [])
+                    continue
+                value = getter(row, state)
+                if value is not SKIP:
+                    item[name] = value
+            data.append(item)
+        return data
+
+
+_compiled = {}
+
+
+def compile_serializer(serializer_class):
+    """Compiled form of ``serializer_class``, or None when it cannot be compiled (cached)."""
+    if serializer_class not in _compiled:
+        try:
+            _compiled[serializer_class] = CompiledSerializer(serializer_class)
+        except NotCompilable as exc:
+            logger.debug("%s is not compilable: %s", serializer_class.__name__, exc)
+            _compiled[serializer_class] = None
+    return _compiled[serializer_class]
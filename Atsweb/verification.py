@@ -0,0 +1,62 @@
+"""
+Email address verification with stateless signed tokens.
+
+The token carries the user id and email, signed with SECRET_KEY and timestamped
+(django.core.signing): nothing is stored, a token expires after
+EMAIL_VERIFICATION_MAX_AGE seconds and stops matching if the email changes.
+Verification emails go through the outbound mail queue (mailqueue.py).
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+
+from .models import OutboundEmail
+
+User = get_user_model()
+
+SALT = 'Atsweb.verification'
+KIND = 'verification'
+
+SUBJECT = "Confirmez votre adresse email"
+BODY = """Bonjour {username},
+
+Merci pour votre inscription. Pour confirmer votre adresse email, ouvrez le lien suivant :
+
+{url}
+
+Ce lien expire dans {days} jour(s). Si vous n'êtes pas à l'origine de cette inscription, ignorez ce message.
+"""
+
+
+def make_token(user):
+    return signing.dumps({'u': user.pk, 'e': user.email}, salt=SALT, compress=True)
+
+
+def check_token(token):
+    """The user the token was issued to, or None (bad signature, expired, email changed)."""
+    try:
+        data = signing.loads(token, salt=SALT, max_age=settings.EMAIL_VERIFICATION_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return User.objects.filter(pk=data.get('u'), email=data.get('e')).first()
+
+
+def build_message(user):
+    return OutboundEmail(
+        kind=KIND,
+        user=user,
+        to_email=user.email,
+        subject=SUBJECT,
+        body=BODY.format(
+            username=user.username,
+            url=settings.EMAIL_VERIFICATION_URL.format(token=make_token(user)),
+            days=max(settings.EMAIL_VERIFICATION_MAX_AGE // 86400, 1),
+        ),
+    )
+
+
+def enqueue_verification(user):
+    """Queue the verification email: one INSERT, no SMTP during the request."""
+    message = build_message(user)
+    message.save()
+    return message
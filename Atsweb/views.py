@@ -3,29 +3,62 @@ from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly, IsAu
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from django.db.models import Count
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date
 from django.utils import timezone
-from datetime import timedelta
 
-from .permissions import IsAdminOrReadOnly, IsAdminOrTemoignageUser
-from .models import Service, Technology, Realisation, Article, Temoignage, PREDEFINED_ADMINS
+from .permissions import IsAdminOrReadOnly, IsAdminOrTemoignageUser, IsAdminRole
+from .exports import export_queryset, filter_date_range, stream_csv, stream_ndjson
+from .media import serve_protected_file
+from .sync import SyncExpired, collect_changes, parse_token
+from .stats import dashboard_stats
+from .rollups import SOURCES, TRUNCATE, timeseries
+from . import snapshots
+from .throttling import SlidingWindowThrottle
+from .valueserializers import compile_serializer
+from .refdata import technology_cache
+from .idempotency import IdempotentCreateMixin
+from .verification import check_token
+from .models import Service, Technology, Realisation, Article, Temoignage, AuditEvent, PREDEFINED_ADMINS
+from .audit import audit
+from .dbpool import database_stats
+from .events import TICKET_TTL, issue_ticket
 from .serializers import (
     UserSerializer, UserListSerializer, MyTokenObtainPairSerializer,
     ServiceSerializer, ServiceListSerializer, TechnologySerializer,
     RealisationSerializer, RealisationListSerializer, ArticleSerializer, ArticleListSerializer,
-    TemoignageSerializer, TemoignageListSerializer, DashboardStatsSerializer
+    TemoignageSerializer, TemoignageListSerializer, DashboardStatsSerializer, AuditEventSerializer
 )
 
 User = get_user_model()
 
 
+class ValuesListMixin:
+    """
+    Unpaginated list responses built from values() rows when the list serializer
+    compiles (Atsweb/valueserializers.py); same output, no model instances.
+    """
+
+    def list(self, request, *args, **kwargs):
+        compiled = compile_serializer(self.get_serializer_class())
+        if compiled is None or self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(compiled.serialize(queryset, context=self.get_serializer_context()))
+
+
 # --- User Registration / Management ---
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ValuesListMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     permission_classes = [AllowAny]  # everyone can register
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_rules = ()  # configured per route in config/urls.py
 
     def get_serializer_class(self):
         """Use different serializers for list vs detail views"""
@@ -68,6 +101,7 @@ class UserViewSet(viewsets.ModelViewSet):
             )
         user.is_active = False
         user.save()
+        audit('suspend', request, user=user, actor=request.user)
         return Response({'status': 'User suspended'}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'])
@@ -76,6 +110,7 @@ class UserViewSet(viewsets.ModelViewSet):
         user = self.get_object()
         user.is_active = True
         user.save()
+        audit('activate', request, user=user, actor=request.user)
         return Response({'status': 'User activated'}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'])
@@ -91,6 +126,7 @@ class UserViewSet(viewsets.ModelViewSet):
             user = self.get_object()
             user.role = 'admin'
             user.save()
+            audit('set_admin', request, user=user, actor=request.user)
             return Response(
                 {'message': f'User {user.username} is now an admin'}, 
                 status=status.HTTP_200_OK
@@ -110,22 +146,62 @@ class UserViewSet(viewsets.ModelViewSet):
 from .models import Candidature
 from .serializers import CandidatureSerializer
 
-class CandidatureViewSet(viewsets.ModelViewSet):
+class ExistingObjectCreateMixin:
+    """
+    create() answers 200 instead of 201 when perform_create() returned an existing
+    object (``self.created = False``). Placed under IdempotentCreateMixin so that
+    Idempotency-Key replays keep the same status.
+    """
+    def create(self, request, *args, **kwargs):
+        self.created = True
+        response = super().create(request, *args, **kwargs)
+        if not self.created:
+            response.status_code = status.HTTP_200_OK
+        return response
+
+
+class CandidatureViewSet(IdempotentCreateMixin, ExistingObjectCreateMixin, viewsets.ModelViewSet):
     queryset = Candidature.objects.all()
     serializer_class = CandidatureSerializer
     permission_classes = [IsAuthenticated]
 
+    def perform_create(self, serializer):
+        # A resubmitted candidature (same CV and type) answers with the existing one
+        duplicate = serializer.find_duplicate(serializer.validated_data.get('user', self.request.user))
+        if duplicate is not None:
+            serializer.instance = duplicate
+            self.created = False
+            return
+        serializer.save()
+
     def get_queryset(self):
+        # Admins may download any CV; everything else is scoped to the owner
+        if self.action == 'cv' and getattr(self.request.user, 'role', None) == 'admin':
+            return self.queryset
         # Only return candidatures for the authenticated user
         return self.queryset.filter(user=self.request.user)
 
+    @action(detail=True, methods=['get'])
+    def cv(self, request, pk=None):
+        """Download the CV (owner or admin), delivered by the front server when configured"""
+        candidature = self.get_object()
+        if not candidature.cv:
+            return Response({'error': 'No CV uploaded'}, status=status.HTTP_404_NOT_FOUND)
+        return serve_protected_file(request, candidature.cv, candidature.cv_filename)
+
 # --- JWT Login with Email ---
 class MyTokenObtainPairView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_rules = ()  # configured per route in config/urls.py
 
     def post(self, request, *args, **kwargs):
         serializer = MyTokenObtainPairSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        if not serializer.is_valid():
+            email = request.data.get('email') if isinstance(request.data, dict) else None
+            audit('login_failed', request, email=email)
+            raise ValidationError(serializer.errors)
+        audit('login', request, user=serializer.validated_data['user_id'])
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 class LogoutView(APIView):
@@ -139,6 +215,7 @@ class LogoutView(APIView):
                 # Blacklist the refresh token to invalidate it
                 token = RefreshToken(refresh_token)
                 token.blacklist()
+            audit('logout', request, user=request.user)
             
             # Optionally, clear any session data
             # If you're using session authentication alongside JWT, you can clear the session
@@ -151,6 +228,8 @@ class LogoutView(APIView):
 # --- Registration View ---
 class RegisterView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_rules = ()  # configured per route in config/urls.py
 
     def post(self, request):
         serializer = UserSerializer(data=request.data)
@@ -166,31 +245,212 @@ class RegisterView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class VerifyEmailView(APIView):
+    """Confirms the address of the account a verification token was sent to"""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        user = check_token(request.query_params.get('token', ''))
+        if user is None:
+            return Response({'error': 'Invalid or expired verification link'}, status=status.HTTP_400_BAD_REQUEST)
+        User.objects.filter(pk=user.pk, is_verified=False).update(is_verified=True)
+        return Response({'message': 'Email verified', 'email': user.email}, status=status.HTTP_200_OK)
+
+
+def parse_date_range(request):
+    """
+    ({'since': date|None, 'until': date|None}, None) from ?since=&until=
+    (YYYY-MM-DD), or (None, 400 response) when one of them is invalid.
+    """
+    dates = {}
+    for param in ('since', 'until'):
+        value = request.query_params.get(param)
+        try:
+            dates[param] = parse_date(value) if value else None
+        except ValueError:
+            dates[param] = None
+        if value and dates[param] is None:
+            return None, Response(
+                {'error': f'Invalid {param} date, expected YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    return dates, None
+
+
 # --- Dashboard Stats View ---
 class DashboardStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         # Calculate stats for dashboard
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        stats = {
-            'total_users': User.objects.count(),
-            'total_articles': Article.objects.count(),
-            'total_services': Service.objects.count(),
-            'total_realisations': Realisation.objects.count(),
-            'total_temoignages': Temoignage.objects.count(),
-            'recent_users': User.objects.filter(date_joined__gte=thirty_days_ago).count(),
-            'active_users': User.objects.filter(is_active=True).count(),
-            'suspended_users': User.objects.filter(is_active=False).count(),
-        }
-        
+        stats = dashboard_stats()
+
         serializer = DashboardStatsSerializer(stats)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class EventTicketView(APIView):
+    """
+    Single-use ticket for the dashboard event stream (EventSource cannot send the JWT).
+    POST /api/events/ticket/ -> {"ticket": ..., "expires_in": 30}, then GET /api/events/?ticket=...
+    """
+    permission_classes = [IsAdminRole]
+
+    def post(self, request):
+        return Response({'ticket': issue_ticket(request.user), 'expires_in': TICKET_TTL})
+
+
+class DashboardTimeseriesView(APIView):
+    """
+    Daily/weekly/monthly counts for the dashboard charts, read from the rollup table.
+    GET /api/dashboard/timeseries/?metric=users|candidatures|content&interval=day|week|month
+        &since=YYYY-MM-DD&until=YYYY-MM-DD
+    """
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        metric = request.query_params.get('metric', 'users')
+        interval = request.query_params.get('interval', 'day')
+        if metric not in SOURCES or interval not in TRUNCATE:
+            return Response(
+                {'error': f'metric must be one of {list(SOURCES)}, interval one of {list(TRUNCATE)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        dates, error = parse_date_range(request)
+        if error:
+            return error
+
+        return Response({
+            'metric': metric,
+            'interval': interval,
+            'series': timeseries(metric, interval, **dates),
+        }, status=status.HTTP_200_OK)
+
+
+class DatabaseHealthView(APIView):
+    """
+    Database round trip and connection reuse metrics (pool usage and waits) of the
+    worker process answering. GET /api/health/db/, 503 when a database is unreachable.
+    """
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        databases = database_stats()
+        healthy = all(entry['healthy'] for entry in databases.values())
+        return Response(
+            {'status': 'healthy' if healthy else 'unhealthy', 'databases': databases},
+            status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+
+# --- Audit log ---
+class AuditEventPagination(CursorPagination):
+    # Keyset pagination on the created_at index: no COUNT(*), no OFFSET
+    ordering = '-created_at'
+    page_size = 50
+
+
+class AuditEventViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Audit trail (admin only), filterable with ?event=, ?user=<id>,
+    ?since=YYYY-MM-DD and ?until=YYYY-MM-DD
+    """
+    queryset = AuditEvent.objects.all()
+    serializer_class = AuditEventSerializer
+    permission_classes = [IsAdminRole]
+    pagination_class = AuditEventPagination
+
+    def get_queryset(self):
+        queryset = self.queryset
+        params = self.request.query_params
+        if params.get('event'):
+            queryset = queryset.filter(event=params['event'])
+        if params.get('user'):
+            try:
+                queryset = queryset.filter(user_id=int(params['user']))
+            except ValueError:
+                raise ValidationError({'user': 'Expected an integer id'})
+        dates, error = parse_date_range(self.request)
+        if error:
+            raise ValidationError(error.data)
+        return filter_date_range(queryset, 'created_at', **dates)
+
+
+# --- Admin exports ---
+class ExportView(APIView):
+    """
+    Stream users or candidatures as CSV or NDJSON (admin only).
+    Optional ?since=YYYY-MM-DD&until=YYYY-MM-DD filters on the creation date.
+    """
+    permission_classes = [IsAdminRole]
+
+    def get(self, request, resource, export_format):
+        dates, error = parse_date_range(request)
+        if error:
+            return error
+
+        queryset = export_queryset(resource, **dates)
+        if export_format == 'csv':
+            response = StreamingHttpResponse(stream_csv(queryset), content_type='text/csv; charset=utf-8')
+        else:
+            response = StreamingHttpResponse(stream_ndjson(queryset), content_type='application/x-ndjson')
+        response['Content-Disposition'] = f'attachment; filename="{resource}.{export_format}"'
+        return response
+
+
+# --- Delta sync for the public content ---
+class SyncView(APIView):
+    """
+    Incremental refresh: GET /api/sync/ returns everything plus a token,
+    GET /api/sync/?since=<token> only what changed or was deleted since
+    (410 once the token is older than SYNC_TOMBSTONE_RETENTION_DAYS).
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = parse_token(since)
+            except (ValueError, OverflowError, OSError):
+                return Response({'error': 'Invalid sync token'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            data = collect_changes(since or None, context={'request': request})
+        except SyncExpired:
+            # Deletions older than the tombstone retention are gone: start over without since
+            return Response({'error': 'Sync token expired, resync without since', 'full_resync': True},
+                            status=status.HTTP_410_GONE)
+        return Response(data, status=status.HTTP_200_OK)
+
+
 # --- CRUD for other models ---
-class ServiceViewSet(viewsets.ModelViewSet):
+class SnapshotReadMixin:
+    """
+    JSON list/detail responses assembled from the pre-serialized snapshots
+    (Atsweb/snapshots.py); other formats and missing snapshots use the serializers.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format == 'json':
+            data = snapshots.assemble_list(self.queryset.model, request)
+            if data is not None:
+                return HttpResponse(data, content_type='application/json')
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            pk = int(kwargs[self.lookup_field])
+        except (KeyError, TypeError, ValueError):
+            # Not a snapshot id: get_object() answers 404
+            return super().retrieve(request, *args, **kwargs)
+        if request.accepted_renderer.format == 'json':
+            data = snapshots.assemble_detail(self.queryset.model, pk, request)
+            if data is not None:
+                return HttpResponse(data, content_type='application/json')
+        return super().retrieve(request, *args, **kwargs)
+
+
+class ServiceViewSet(SnapshotReadMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Service.objects.all().order_by('-heure_cree')
     permission_classes = [IsAdminOrReadOnly]
 
@@ -208,8 +468,22 @@ class TechnologyViewSet(viewsets.ModelViewSet):
     serializer_class = TechnologySerializer
     permission_classes = [IsAdminOrReadOnly]
 
+    # Reads come from the in-process reference cache (Atsweb/refdata.py)
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer(technology_cache.all(), many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            technology = technology_cache.get(int(kwargs[self.lookup_field]))
+        except ValueError:
+            technology = None
+        if technology is None:
+            return super().retrieve(request, *args, **kwargs)
+        return Response(self.get_serializer(technology).data)
+
 
-class RealisationViewSet(viewsets.ModelViewSet):
+class RealisationViewSet(SnapshotReadMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Realisation.objects.all().order_by('-heure_cree')
     permission_classes = [IsAdminOrReadOnly]
 
@@ -222,17 +496,23 @@ class RealisationViewSet(viewsets.ModelViewSet):
         serializer.save(auteur=self.request.user)
 
 
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(SnapshotReadMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Article.objects.all().order_by('-heure_cree')
     permission_classes = [IsAdminOrReadOnly]
 
+    def get_queryset(self):
+        if self.action == 'list':
+            # The list only shows the excerpt: leave the full body in the database
+            return self.queryset.select_related('auteur').defer('description', 'description_html')
+        return self.queryset
+
     def get_serializer_class(self):
         if self.action == 'list':
             return ArticleListSerializer
         return ArticleSerializer
 
 
-class TemoignageViewSet(viewsets.ModelViewSet):
+class TemoignageViewSet(SnapshotReadMixin, ValuesListMixin, IdempotentCreateMixin, viewsets.ModelViewSet):
     queryset = Temoignage.objects.all().order_by('-heure_cree')
     permission_classes = [IsAdminOrTemoignageUser]
 
@@ -2,6 +2,10 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Besides the Django application it serves the admin dashboard event stream
+(server-sent events) on ``/api/events/``, see ``Atsweb.events``.
+With DJANGO_PRELOAD=1 the application is also warmed up at import time, for
+servers that load it before forking workers (see config/preload.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +17,20 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once the app registry is ready
+from Atsweb.events import sse_application  # noqa: E402
+from config.preload import preload, preload_enabled  # noqa: E402
+
+EVENTS_PATH = '/api/events/'
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+        return await sse_application(scope, receive, send)
+    return await django_application(scope, receive, send)
+
+
+if preload_enabled():
+    preload()
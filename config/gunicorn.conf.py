@@ -0,0 +1,38 @@
+"""
+Gunicorn settings: ``gunicorn -c config/gunicorn.conf.py config.wsgi`` (or
+``config.asgi`` with ``GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker``).
+
+The application is loaded and warmed up once in the master (preload_app +
+DJANGO_PRELOAD, see config/preload.py); workers are forked from it ready to serve.
+"""
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_PRELOAD', '1')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+preload_app = True
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 0))
+
+# Threads and event loops share connections through a pool; a sync worker serves
+# one request at a time and simply keeps its connection (see config/settings.py)
+if threads > 1 or 'uvicorn' in worker_class:
+    os.environ.setdefault('DB_CONN_MODE', 'pool')
+    os.environ.setdefault('DB_POOL_MAX_SIZE', str(max(threads, 4)))
+
+# Throttling counters and the other shared cache state need atomic operations
+# between workers: only the Redis backend provides them (see config/settings.py)
+if workers > 1 and not os.environ.get('REDIS_URL'):
+    raise RuntimeError(f"{workers} workers need REDIS_URL; set GUNICORN_WORKERS=1 to run without Redis")
+
+
+def post_fork(server, worker):
+    # preload() closed them before the fork; make sure no warmer reopened one
+    from django.db import connections
+    from Atsweb.dbpool import close_pools
+    connections.close_all()
+    close_pools()
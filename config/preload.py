@@ -0,0 +1,110 @@
+"""
+Preload mode for config/wsgi.py and config/asgi.py (DJANGO_PRELOAD=1, set by
+config/gunicorn.conf.py together with preload_app).
+
+The application is imported once in the master process, then everything a worker
+would otherwise do lazily on its first requests is done here: URL resolution,
+DRF settings and authenticators, password hasher, serializer fields, per-process
+caches (content types, technologies). The GC heap is then frozen so forked
+workers keep sharing those pages (copy-on-write) instead of touching them on
+their first collection.
+"""
+import gc
+import logging
+import os
+import time
+
+from django.db import connections
+
+from Atsweb.dbpool import close_pools
+
+logger = logging.getLogger(__name__)
+
+
+def preload_enabled():
+    return os.environ.get('DJANGO_PRELOAD', '').lower() in ('1', 'true', 'yes')
+
+
+def warm_urls():
+    from django.urls import get_resolver
+    resolver = get_resolver()
+    # Builds the reverse/namespace dicts of every included resolver
+    resolver.reverse_dict
+    resolver.namespace_dict
+
+
+def warm_rest_framework():
+    from rest_framework.settings import api_settings
+    from rest_framework_simplejwt.settings import api_settings as jwt_settings
+    from rest_framework_simplejwt.state import token_backend
+    for name in ('DEFAULT_AUTHENTICATION_CLASSES', 'DEFAULT_PERMISSION_CLASSES',
+                 'DEFAULT_RENDERER_CLASSES', 'DEFAULT_PARSER_CLASSES',
+                 'DEFAULT_CONTENT_NEGOTIATION_CLASS', 'EXCEPTION_HANDLER'):
+        getattr(api_settings, name)
+    jwt_settings.AUTH_TOKEN_CLASSES
+    # Loads the signing backend (PyJWT, algorithms)
+    token_backend.get_leeway()
+
+
+def warm_hashers():
+    from django.contrib.auth.hashers import get_hashers
+    # Imports argon2/bcrypt and builds the algorithm map
+    get_hashers()
+
+
+def warm_serializers():
+    from Atsweb import serializers
+    from Atsweb.valueserializers import compile_serializer
+    from rest_framework.serializers import ModelSerializer
+    for value in vars(serializers).values():
+        if isinstance(value, type) and issubclass(value, ModelSerializer) and value.__module__ == serializers.__name__:
+            # Field construction (model introspection) happens on first use
+            value().fields
+            compile_serializer(value)
+
+
+def warm_content_types():
+    from django.apps import apps
+    from django.contrib.contenttypes.models import ContentType
+    ContentType.objects.get_for_models(*apps.get_models())
+
+
+def warm_reference_data():
+    from Atsweb.refdata import technology_cache
+    technology_cache.all()
+
+
+def warm_storage():
+    from Atsweb.storage import content_addressed_storage
+    content_addressed_storage()
+
+
+# (name, callable), run in order; a failing warmer is logged and skipped
+WARMERS = [
+    ('urls', warm_urls),
+    ('rest_framework', warm_rest_framework),
+    ('hashers', warm_hashers),
+    ('serializers', warm_serializers),
+    ('content_types', warm_content_types),
+    ('reference_data', warm_reference_data),
+    ('storage', warm_storage),
+]
+
+
+def preload():
+    """Warm the loaded application up, then freeze the heap. Returns {warmer: seconds}."""
+    timings = {}
+    for name, warmer in WARMERS:
+        start = time.perf_counter()
+        try:
+            warmer()
+        except Exception:
+            logger.exception("Preload warmer %s failed", name)
+        timings[name] = time.perf_counter() - start
+    # Never hand a database socket (or a pool and its threads) over to forked workers
+    connections.close_all()
+    close_pools()
+    gc.collect()
+    gc.freeze()
+    logger.info("Preloaded in %.3fs (%d objects frozen)", sum(timings.values()), gc.get_freeze_count())
+    return timings
@@ -11,9 +11,13 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
+import logging
 import os
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -48,16 +52,54 @@ INSTALLED_APPS = [
 ]
 
 REST_FRAMEWORK = {
+    # One authenticator picked from the headers (Bearer -> JWT, Basic -> cached Basic,
+    # else session cookie) instead of trying Session, JWT and Basic in turn
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.SessionAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        'Atsweb.authentication.HeaderDispatchAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ]
 }
 
+# Outgoing mail. Defaults target a local SMTP stand-in on port 1025, e.g.
+# `python -m aiosmtpd -n -l localhost:1025`; emails are sent by `manage.py send_mail_queue`
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 1025))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False') == 'True'
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 10))
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'no-reply@example.com')
+
+# Email verification (Atsweb/verification.py): link sent to new users, {token} is replaced
+EMAIL_VERIFICATION_URL = os.environ.get(
+    'EMAIL_VERIFICATION_URL', 'http://localhost:8000/api/auth/verify-email/?token={token}')
+EMAIL_VERIFICATION_MAX_AGE = int(os.environ.get('EMAIL_VERIFICATION_MAX_AGE', 3 * 24 * 3600))
+
+# Outbound mail queue (Atsweb/mailqueue.py): retry after 1, 2, 4... min, at most 1 h apart
+MAIL_QUEUE_MAX_ATTEMPTS = int(os.environ.get('MAIL_QUEUE_MAX_ATTEMPTS', 8))
+MAIL_QUEUE_RETRY_BASE = int(os.environ.get('MAIL_QUEUE_RETRY_BASE', 60))
+MAIL_QUEUE_RETRY_MAX = int(os.environ.get('MAIL_QUEUE_RETRY_MAX', 3600))
+
+# /api/sync/ deletion tombstones are kept this long (purge_tombstones); older
+# sync tokens get 410 and the client resyncs from scratch
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+# Public site (front end) used for the links of sitemap.xml and the feeds (Atsweb/sitemaps.py)
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:5173')
+FEED_TITLE = os.environ.get('FEED_TITLE', 'Articles')
+SITEMAP_CHUNK_SIZE = int(os.environ.get('SITEMAP_CHUNK_SIZE', 10000))  # primary keys per sitemap file
+SITEMAP_STAMP_TTL = int(os.environ.get('SITEMAP_STAMP_TTL', 24 * 3600))  # full rebuild at least daily
+SITEMAP_MAX_AGE = int(os.environ.get('SITEMAP_MAX_AGE', 600))
+
+# Seconds a response to a POST with an Idempotency-Key is replayed (Atsweb/idempotency.py,
+# expired keys removed by `manage.py purge_idempotency_keys`)
+IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', 24 * 3600))
+
+# Seconds a verified Basic auth credential stays cached (Atsweb/authentication.py)
+BASIC_AUTH_CACHE_TTL = int(os.environ.get('BASIC_AUTH_CACHE_TTL', 300))
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -115,18 +157,78 @@ WSGI_APPLICATION = 'config.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'backendDb',
-        'USER': 'ats2',
-        'PASSWORD': 'ats',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'NAME': os.environ.get('DB_NAME', 'backendDb'),
+        'USER': os.environ.get('DB_USER', 'ats2'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', 'ats'),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+        # Reused connections are checked (SELECT 1 / pool check) before serving a request
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# How requests get their connection (see Atsweb/dbpool.py):
+#   persistent  one connection per worker thread, kept DB_CONN_MAX_AGE seconds (sync workers)
+#   pool        psycopg 3 pool per process, for threaded (gthread) and ASGI serving;
+#               needs psycopg[pool]. Size it so that workers * DB_POOL_MAX_SIZE
+#               stays under the server's max_connections.
+#   none        a new connection per request
+DB_CONN_MODE = os.environ.get('DB_CONN_MODE', 'persistent')
+if DB_CONN_MODE == 'pool':
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            # Seconds a request waits for a free connection before failing
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 600)),
+            'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800)),
+            'name': 'default',
+        },
+    }
+elif DB_CONN_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+elif DB_CONN_MODE != 'none':
+    raise ValueError(f"DB_CONN_MODE must be persistent, pool or none, not {DB_CONN_MODE!r}")
+
+# Cache shared by all worker processes: rate limiting counters, Basic credentials,
+# reference data versions... These rely on atomic add()/incr(), which only Redis
+# provides across processes; config/gunicorn.conf.py refuses several workers without it.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif not DEBUG:
+    raise ImproperlyConfigured("REDIS_URL is required when DEBUG is off (atomic shared cache)")
+else:
+    # Development only: add()/incr() are read-then-write here, not atomic between processes
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        }
+    }
+
+# Audit log (Atsweb/audit.py): events are buffered per worker and written in bulk
+# once AUDIT_BUFFER_SIZE events are pending or the oldest is AUDIT_FLUSH_INTERVAL seconds old
+AUDIT_BUFFER_SIZE = int(os.environ.get('AUDIT_BUFFER_SIZE', 200))
+AUDIT_FLUSH_INTERVAL = int(os.environ.get('AUDIT_FLUSH_INTERVAL', 5))
+
 # settings.py
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Protected media (candidature CVs, /api/candidatures/<id>/cv/): once the view has
+# checked access, 'nginx' hands the file off with X-Accel-Redirect (PROTECTED_MEDIA_INTERNAL_URL
+# must be an `internal` location aliased to MEDIA_ROOT), 'sendfile' uses X-Sendfile
+# (Apache/lighttpd). Empty: Django streams the file itself (local runs).
+PROTECTED_MEDIA_SERVER = os.environ.get('PROTECTED_MEDIA_SERVER', '')
+PROTECTED_MEDIA_INTERNAL_URL = os.environ.get('PROTECTED_MEDIA_INTERNAL_URL', '/protected-media/')
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -145,6 +247,27 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: Argon2 (argon2-cffi) tuned with `manage.py calibrate_hasher`.
+# Hashes made with other parameters or the previous PBKDF2 hasher are upgraded
+# on the next successful login.
+ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(os.environ.get('ARGON2_MEMORY_COST', 65536))  # KiB
+ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', 2))
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+if importlib.util.find_spec('argon2'):
+    PASSWORD_HASHERS.insert(0, 'Atsweb.hashers.CalibratedArgon2PasswordHasher')
+else:
+    logging.getLogger(__name__).warning(
+        "argon2-cffi is not installed: new passwords are hashed with PBKDF2 "
+        "(pip install argon2-cffi to use the calibrated Argon2 hasher)"
+    )
+
 AUTH_USER_MODEL = 'Atsweb.User'
 
 
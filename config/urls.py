@@ -1,7 +1,10 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.static import serve
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.routers import DefaultRouter
@@ -16,10 +19,23 @@ from Atsweb.views import (
     TemoignageViewSet,
     MyTokenObtainPairView,
     DashboardStatsView,  # Add this view for dashboard stats
+    EventTicketView,
     RegisterView,        # Add this for user registration
     CurrentUserView,
-    CandidatureViewSet          # Add this for current user details
+    CandidatureViewSet,          # Add this for current user details
+    ExportView,
+    SyncView,
+    DashboardTimeseriesView,
+    AuditEventViewSet,
+    VerifyEmailView,
+    DatabaseHealthView,
 )
+from Atsweb.sitemaps import sitemap_index, sitemap_chunk, articles_feed
+
+# Rate limits for the routes that hash passwords: (scope, rate) pairs checked
+# before the view runs, shared between workers through the cache
+LOGIN_THROTTLE_RULES = [('ip', '30/min'), ('email', '5/min')]
+REGISTER_THROTTLE_RULES = [('ip', '10/h')]
 
 # Create DRF router
 router = DefaultRouter()
@@ -30,22 +46,44 @@ router.register(r'realisations', RealisationViewSet)
 router.register(r'articles', ArticleViewSet)
 router.register(r'temoignages', TemoignageViewSet)
 router.register(r'candidatures', CandidatureViewSet)
+router.register(r'audit', AuditEventViewSet)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
+    # Registration through the viewset hashes too; list/detail stay unthrottled (GET)
+    path('api/users/', UserViewSet.as_view({'get': 'list', 'post': 'create'},
+                                           throttle_rules=REGISTER_THROTTLE_RULES)),
+
     # API routes
     path('api/', include(router.urls)),  # Changed from 'Atsweb/' to 'api/' for clarity
     
     # Authentication endpoints
-    path('api/auth/login/', csrf_exempt(MyTokenObtainPairView.as_view()), name='token_obtain_pair'),
+    path('api/auth/login/', csrf_exempt(MyTokenObtainPairView.as_view(throttle_rules=LOGIN_THROTTLE_RULES)), name='token_obtain_pair'),
     path('api/auth/refresh/', ensure_csrf_cookie(TokenRefreshView.as_view()), name='token_refresh'),
     path('api/auth/logout/', LogoutView.as_view(), name='logout'),
-    path('api/auth/register/', RegisterView.as_view(), name='register'),
+    path('api/auth/register/', RegisterView.as_view(throttle_rules=REGISTER_THROTTLE_RULES), name='register'),
+    path('api/auth/verify-email/', VerifyEmailView.as_view(), name='verify_email'),
     
+    # Crawlers and feed readers (conditional GET, answered 304 from the cache)
+    path('sitemap.xml', sitemap_index, name='sitemap'),
+    path('sitemap-<str:section>-<int:chunk>.xml', sitemap_chunk, name='sitemap_chunk'),
+    re_path(r'^feeds/articles\.(?P<feed_format>rss|atom)$', articles_feed, name='articles_feed'),
+
+    # Incremental content refresh for the apps (?since=<token>)
+    path('api/sync/', SyncView.as_view(), name='sync'),
+
     # Dashboard specific endpoints
     path('api/dashboard/stats/', DashboardStatsView.as_view(), name='dashboard_stats'),
+    path('api/dashboard/timeseries/', DashboardTimeseriesView.as_view(), name='dashboard_timeseries'),
+    path('api/health/db/', DatabaseHealthView.as_view(), name='health_db'),
+    # Ticket opening the dashboard event stream (/api/events/, ASGI only)
+    path('api/events/ticket/', EventTicketView.as_view(), name='events_ticket'),
     
+    # Admin exports, e.g. /api/export/users.csv?since=2025-01-01
+    re_path(r'^api/export/(?P<resource>users|candidatures)\.(?P<export_format>csv|ndjson)$',
+            ExportView.as_view(), name='export'),
+
     # User management actions (for admin dashboard)
     path('api/users/<int:user_id>/suspend/', UserViewSet.as_view({'post': 'suspend'}), name='user_suspend'),
     path('api/users/<int:user_id>/activate/', UserViewSet.as_view({'post': 'activate'}), name='user_activate'),
@@ -57,7 +95,11 @@ urlpatterns = [
     path('api/current-user/', CurrentUserView.as_view(), name='current-user'),
 ]
 
-# Serve media files in development
+# Serve media files in development, except the CVs: they are only reachable
+# through the authorized download endpoint (/api/candidatures/<id>/cv/)
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += [
+        re_path(rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?!candidatures/)(?P<path>.*)$',
+                serve, {'document_root': settings.MEDIA_ROOT}),
+    ]
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file